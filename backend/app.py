@@ -4,12 +4,15 @@ from flask import Flask
 
 from backend.auth import init_auth
 from backend.config import Config
+from backend.db import configure_database, configure_engine, prepare_schema
+from backend.instrumentation import init_instrumentation
 from backend.models import db
 from backend.routes import (
     clients_bp,
     dashboard_bp,
     events_bp,
     export_bp,
+    imports_bp,
     policies_bp,
     reminders_bp,
     settings_bp,
@@ -26,6 +29,7 @@ def register_blueprints(app: Flask) -> None:
     app.register_blueprint(dashboard_bp)
     app.register_blueprint(settings_bp)
     app.register_blueprint(export_bp)
+    app.register_blueprint(imports_bp)
 
 
 
@@ -33,15 +37,18 @@ def create_app() -> Flask:
     """Application factory."""
     app = Flask(__name__)
     app.config.from_object(Config)
+    configure_database(app)
 
     db.init_app(app)
 
     with app.app_context():
-        db.create_all()
+        configure_engine(db.engine, app.config)
+        prepare_schema(db.engine)
+        init_instrumentation(app, db.engine)
 
     init_auth(app)
     register_blueprints(app)
-    app.scheduler = init_scheduler(app)
+    app.scheduler = init_scheduler(app) if app.config["SCHEDULER_ENABLED"] else None
 
     return app
 
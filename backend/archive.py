@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from datetime import datetime
+import logging
+
+from sqlalchemy import DateTime, delete, insert, literal, select
+
+from backend.models import Reminder, ReminderArchive, db
+
+
+logger = logging.getLogger(__name__)
+
+_ARCHIVED_COLUMNS = ("tresc", "data_przypomnienia", "wyslano", "client_id", "policy_id")
+
+
+def _archivable(cutoff: datetime):
+    return (Reminder.wyslano.is_(True), Reminder.data_przypomnienia < cutoff)
+
+
+def archive_sent_reminders(cutoff: datetime, batch_size: int = 1000) -> int:
+    """Move sent reminders due before ``cutoff`` to ``reminders_archive``.
+
+    Each batch is one transaction of three set-based statements: lock the
+    batch's ids, copy the rows with ``INSERT ... SELECT`` and delete them, so
+    no row data passes through Python. Returns the number of archived rows.
+    """
+    moved = 0
+    batch_size = max(1, batch_size)
+    while True:
+        # FOR UPDATE (ignored by SQLite, which locks the whole database on
+        # the first write) keeps an edit from slipping between copy and delete.
+        ids = list(
+            db.session.scalars(
+                select(Reminder.id)
+                .where(*_archivable(cutoff))
+                .order_by(Reminder.id)
+                .limit(batch_size)
+                .with_for_update()
+            )
+        )
+        if not ids:
+            break
+
+        source = Reminder.__table__
+        db.session.execute(
+            insert(ReminderArchive.__table__).from_select(
+                ["reminder_id", *_ARCHIVED_COLUMNS, "data_archiwizacji"],
+                select(
+                    source.c.id,
+                    *(source.c[name] for name in _ARCHIVED_COLUMNS),
+                    literal(datetime.utcnow(), DateTime),
+                ).where(source.c.id.in_(ids)),
+            )
+        )
+        db.session.execute(delete(source).where(source.c.id.in_(ids)))
+        db.session.commit()
+        moved += len(ids)
+        if len(ids) < batch_size:
+            break
+
+    if moved:
+        logger.info("Archived %s sent reminders due before %s", moved, cutoff)
+    return moved
+
+
+def find_archived(reminder_id: int) -> ReminderArchive | None:
+    """Return the archived copy of the reminder that had ``reminder_id``."""
+    return (
+        ReminderArchive.query.filter_by(reminder_id=reminder_id)
+        .order_by(ReminderArchive.id.desc())
+        .first()
+    )
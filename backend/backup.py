@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from datetime import datetime
+import gzip
+import logging
+from pathlib import Path
+import shutil
+import sqlite3
+import zlib
+
+from backend.config import Config
+from backend.db import is_sqlite_url, normalize_database_url, resolve_sqlite_path
+
+
+logger = logging.getLogger(__name__)
+
+BACKUP_PREFIX = "crm-"
+BACKUP_SUFFIX = ".sqlite3.gz"
+_COPY_CHUNK = 1024 * 1024
+
+
+class BackupError(RuntimeError):
+    """Raised when a snapshot cannot be created or fails verification."""
+
+
+def _check_integrity(path: Path) -> None:
+    connection = sqlite3.connect(path)
+    try:
+        result = connection.execute("PRAGMA integrity_check").fetchall()
+    finally:
+        connection.close()
+    if result != [("ok",)]:
+        problems = "; ".join(row[0] for row in result[:5])
+        raise BackupError(f"Integrity check failed for {path.name}: {problems}")
+
+
+def _copy_online(source: Path, target: Path, pages_per_step: int, step_sleep: float) -> None:
+    # The backup API copies `pages_per_step` pages per step, so the copy never
+    # holds the database for long. On its own, a write from another connection
+    # restarts the copy; under WAL the read transaction opened first pins one
+    # snapshot instead, so the copy finishes while the application keeps writing.
+    source_connection = sqlite3.connect(source, timeout=30, isolation_level=None)
+    target_connection = sqlite3.connect(target)
+    try:
+        source_connection.execute("BEGIN")
+        source_connection.execute("SELECT count(*) FROM sqlite_master").fetchone()
+        source_connection.backup(
+            target_connection, pages=max(1, pages_per_step), sleep=step_sleep
+        )
+        source_connection.execute("COMMIT")
+    finally:
+        target_connection.close()
+        source_connection.close()
+
+
+def _compress(source: Path, target: Path) -> None:
+    with source.open("rb") as raw, gzip.open(target, "wb", compresslevel=6) as compressed:
+        shutil.copyfileobj(raw, compressed, _COPY_CHUNK)
+
+
+def _verify_archive(path: Path) -> None:
+    """Read the archive back so a truncated file or CRC mismatch is caught now."""
+    try:
+        with gzip.open(path, "rb") as compressed:
+            while compressed.read(_COPY_CHUNK):
+                pass
+    except (OSError, EOFError, zlib.error) as exc:
+        raise BackupError(f"Compressed snapshot {path.name} is unreadable: {exc}") from exc
+
+
+def list_backups(backup_dir: Path) -> list[Path]:
+    """Return existing snapshots, oldest first."""
+    return sorted(backup_dir.glob(f"{BACKUP_PREFIX}*{BACKUP_SUFFIX}"))
+
+
+def rotate_backups(backup_dir: Path, keep: int) -> list[Path]:
+    """Delete all but the newest ``keep`` snapshots and return the deleted paths."""
+    snapshots = list_backups(backup_dir)
+    removed = snapshots[: max(0, len(snapshots) - max(1, keep))]
+    for path in removed:
+        path.unlink(missing_ok=True)
+    return removed
+
+
+def create_backup(
+    database_url: str | None,
+    backup_dir: str | Path,
+    keep: int = 7,
+    pages_per_step: int = 1024,
+    step_sleep: float = 0.05,
+) -> Path:
+    """Take a compressed, verified snapshot of a live SQLite database.
+
+    The database is copied with SQLite's online backup API, checked with
+    ``PRAGMA integrity_check``, gzip-compressed and read back before older
+    snapshots are rotated out. Returns the path of the new snapshot.
+    """
+    url = normalize_database_url(database_url or Config.SQLALCHEMY_DATABASE_URI)
+    if not is_sqlite_url(url):
+        raise BackupError("Online backups support SQLite only; use pg_dump for PostgreSQL.")
+    source = resolve_sqlite_path(url)
+    if not source.exists():
+        raise BackupError(f"Database file {source} does not exist.")
+
+    backup_dir = Path(backup_dir)
+    backup_dir.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    target = backup_dir / f"{BACKUP_PREFIX}{stamp}{BACKUP_SUFFIX}"
+    raw_copy = backup_dir / f".{BACKUP_PREFIX}{stamp}.sqlite3.tmp"
+    partial = backup_dir / f".{target.name}.part"
+
+    try:
+        _copy_online(source, raw_copy, pages_per_step, step_sleep)
+        _check_integrity(raw_copy)
+        _compress(raw_copy, partial)
+        _verify_archive(partial)
+        partial.replace(target)
+    finally:
+        raw_copy.unlink(missing_ok=True)
+        partial.unlink(missing_ok=True)
+
+    removed = rotate_backups(backup_dir, keep)
+    logger.info(
+        "Database backup written to %s (%s bytes, %s old snapshots removed)",
+        target,
+        target.stat().st_size,
+        len(removed),
+    )
+    return target
@@ -21,6 +21,91 @@ class Config:
     )
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # Connection pool for server databases such as PostgreSQL (ignored for
+    # SQLite). Each web worker process gets its own pool of this size.
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+
+    # SQLite tuning, applied to every new connection (see backend/db.py).
+    # WAL lets readers run alongside the writer; busy_timeout makes writers wait
+    # for the lock instead of failing with "database is locked".
+    SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "10000"))
+    SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))
+    SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    SQLITE_TEMP_STORE = os.getenv("SQLITE_TEMP_STORE", "MEMORY")
+
+    # Online backups (see backend/backup.py and scripts/backup_db.py)
+    BACKUP_ENABLED = os.getenv("BACKUP_ENABLED", "false").lower() == "true"
+    BACKUP_DIR = os.getenv("BACKUP_DIR", str(BASE_DIR / "backups"))
+    BACKUP_KEEP = int(os.getenv("BACKUP_KEEP", "7"))
+    BACKUP_HOUR = int(os.getenv("BACKUP_HOUR", "2"))
+    BACKUP_PAGES_PER_STEP = int(os.getenv("BACKUP_PAGES_PER_STEP", "1024"))
+
+    # Scheduler
+    # Only one process runs the scheduler: the one holding the owner lease,
+    # renewed every third of SCHEDULER_OWNER_LEASE_SECONDS. Other processes
+    # with the scheduler enabled stand by and take over when it stops.
+    SCHEDULER_ENABLED = os.getenv("SCHEDULER_ENABLED", "true").lower() == "true"
+    SCHEDULER_OWNER_LEASE_SECONDS = int(os.getenv("SCHEDULER_OWNER_LEASE_SECONDS", "60"))
+    # How often the scheduler picks up settings saved by other processes.
+    SCHEDULER_RECONCILE_SECONDS = int(os.getenv("SCHEDULER_RECONCILE_SECONDS", "60"))
+    SCHEDULER_LEASE_SECONDS = int(os.getenv("SCHEDULER_LEASE_SECONDS", "600"))
+    # Keep jobs in the application database so runs missed while the app was
+    # down are caught up (once) within the grace period.
+    SCHEDULER_PERSISTENT_JOBS = os.getenv("SCHEDULER_PERSISTENT_JOBS", "true").lower() == "true"
+    SCHEDULER_MISFIRE_GRACE_SECONDS = int(os.getenv("SCHEDULER_MISFIRE_GRACE_SECONDS", "21600"))
+
+    # Reminder dispatch
+    # "daily" sends once a day at UserConfig.send_hour, "realtime" arms a timer
+    # for the next due reminder.
+    REMINDER_DELIVERY_MODE = os.getenv("REMINDER_DELIVERY_MODE", "daily")
+    REMINDER_RETRY_SECONDS = int(os.getenv("REMINDER_RETRY_SECONDS", "300"))
+    # Nightly job creating reminders for policies expiring within
+    # UserConfig.dni_przed_wygasnieciem days.
+    EXPIRY_REMINDERS_ENABLED = os.getenv("EXPIRY_REMINDERS_ENABLED", "false").lower() == "true"
+    # Nightly job moving sent reminders older than this many days to
+    # reminders_archive, so dashboard and dispatch scans stay small. Opt-in,
+    # as it deletes rows from reminders.
+    REMINDER_ARCHIVE_ENABLED = os.getenv("REMINDER_ARCHIVE_ENABLED", "false").lower() == "true"
+    REMINDER_ARCHIVE_AFTER_DAYS = int(os.getenv("REMINDER_ARCHIVE_AFTER_DAYS", "180"))
+    REMINDER_ARCHIVE_BATCH_SIZE = int(os.getenv("REMINDER_ARCHIVE_BATCH_SIZE", "1000"))
+    REMINDER_DISPATCH_WORKERS = int(os.getenv("REMINDER_DISPATCH_WORKERS", "1"))
+    REMINDER_DISPATCH_CHUNK_SIZE = int(os.getenv("REMINDER_DISPATCH_CHUNK_SIZE", "500"))
+    # Send all due reminders as a single digest email grouped by client and policy.
+    REMINDER_DIGEST_ENABLED = os.getenv("REMINDER_DIGEST_ENABLED", "false").lower() == "true"
+
+    # Dashboard: reminders shown per bucket (with a total count) and how long
+    # the buckets are cached; reminder, client and policy writes clear the cache.
+    DASHBOARD_BUCKET_LIMIT = int(os.getenv("DASHBOARD_BUCKET_LIMIT", "50"))
+    DASHBOARD_CACHE_SECONDS = int(os.getenv("DASHBOARD_CACHE_SECONDS", "30"))
+
+    # How long a process keeps the SMTP/recipient/send hour snapshot before
+    # re-reading UserConfig; commits in the same process clear it at once.
+    SETTINGS_CACHE_SECONDS = int(os.getenv("SETTINGS_CACHE_SECONDS", "30"))
+
+    # List views
+    LIST_PAGE_SIZE = int(os.getenv("LIST_PAGE_SIZE", "50"))
+    # Rows per section (policies, events, reminders) on the client detail page.
+    CLIENT_DETAIL_PAGE_SIZE = int(os.getenv("CLIENT_DETAIL_PAGE_SIZE", "20"))
+
+    # Search: suggestions returned by the client/policy pickers in forms.
+    AUTOCOMPLETE_LIMIT = int(os.getenv("AUTOCOMPLETE_LIMIT", "10"))
+
+    # CSV export: rows fetched from the database and written per streamed chunk.
+    EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "1000"))
+
+    # Per-request SQL instrumentation (see backend/instrumentation.py)
+    SQL_INSTRUMENTATION_ENABLED = os.getenv("SQL_INSTRUMENTATION_ENABLED", "true").lower() == "true"
+    SQL_NPLUSONE_THRESHOLD = int(os.getenv("SQL_NPLUSONE_THRESHOLD", "10"))
+    # Debugging aid: exposes query counts and DB time to every client, so it is
+    # off unless enabled for development or benchmarks.
+    SQL_SERVER_TIMING = os.getenv("SQL_SERVER_TIMING", "false").lower() == "true"
+
     # SMTP settings
     MAIL_SERVER = os.getenv("MAIL_SERVER", "smtp.example.com")
     MAIL_PORT = int(os.getenv("MAIL_PORT", "587"))
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+import logging
+import threading
+from time import monotonic
+from typing import Any
+from zoneinfo import ZoneInfo
+
+from flask import current_app
+from sqlalchemy import case, event, func, select
+from sqlalchemy.orm import Session, joinedload
+
+from backend.config import Config
+from backend.models import Client, Policy, Reminder, db
+
+
+logger = logging.getLogger(__name__)
+
+_SESSION_FLAG = "dashboard_changed"
+
+# (key, label, CSS class) in display order; the position is the bucket CASE value.
+BUCKETS = (
+    ("overdue", "Zaległe", "status-overdue"),
+    ("today", "Dziś", "status-today"),
+    ("upcoming", "Następne 7 dni", "status-upcoming"),
+)
+
+
+@dataclass(frozen=True)
+class Bucket:
+    items: list[dict[str, Any]]
+    total: int
+
+
+@dataclass(frozen=True)
+class _CacheEntry:
+    day: date
+    expires_at: float
+    buckets: dict[str, Bucket]
+
+
+_lock = threading.Lock()
+_version = 0
+_cached: _CacheEntry | None = None
+
+
+def _get_timezone() -> ZoneInfo:
+    try:
+        return ZoneInfo(Config.TIMEZONE)
+    except Exception:
+        logger.exception("Invalid TIMEZONE configuration: %s", Config.TIMEZONE)
+        return ZoneInfo("UTC")
+
+
+def _local_now_naive() -> datetime:
+    return datetime.now(_get_timezone()).replace(tzinfo=None)
+
+
+def _serialize(reminder: Reminder, label: str, css_class: str) -> dict[str, Any]:
+    # Plain values only: cached entries outlive the session that loaded them.
+    client = reminder.client
+    return {
+        "id": reminder.id,
+        "tresc": reminder.tresc,
+        "data_przypomnienia": reminder.data_przypomnienia,
+        "client_name": f"{client.imie} {client.nazwisko}" if client else None,
+        "policy_number": reminder.policy.numer_polisy if reminder.policy else None,
+        "status_label": label,
+        "status_class": css_class,
+    }
+
+
+def _load_buckets(today: date, limit: int) -> dict[str, Bucket]:
+    start_today = datetime.combine(today, time.min)
+    end_today = datetime.combine(today, time.max)
+    next_seven_end = datetime.combine(today + timedelta(days=7), time.max)
+
+    bucket = case(
+        (Reminder.data_przypomnienia < start_today, 0),
+        (Reminder.data_przypomnienia <= end_today, 1),
+        else_=2,
+    )
+    # One pass over the (wyslano, data_przypomnienia) index numbers the rows of
+    # each bucket and counts them, so only the first `limit` of each are joined
+    # and loaded while the totals still cover a backlog of any size.
+    ranked = (
+        select(
+            Reminder.id,
+            bucket.label("bucket"),
+            func.row_number()
+            .over(partition_by=bucket, order_by=(Reminder.data_przypomnienia, Reminder.id))
+            .label("position"),
+            func.count().over(partition_by=bucket).label("total"),
+        )
+        .where(Reminder.wyslano.is_(False), Reminder.data_przypomnienia <= next_seven_end)
+        .subquery()
+    )
+    rows = db.session.execute(
+        select(Reminder, ranked.c.bucket, ranked.c.total)
+        .join(ranked, ranked.c.id == Reminder.id)
+        .where(ranked.c.position <= limit)
+        .options(joinedload(Reminder.client), joinedload(Reminder.policy))
+        .order_by(Reminder.data_przypomnienia, Reminder.id)
+    ).all()
+
+    items: dict[int, list[dict[str, Any]]] = {index: [] for index in range(len(BUCKETS))}
+    totals: dict[int, int] = {}
+    for reminder, index, total in rows:
+        _, label, css_class = BUCKETS[index]
+        items[index].append(_serialize(reminder, label, css_class))
+        totals[index] = total
+    return {
+        key: Bucket(items=items[index], total=totals.get(index, 0))
+        for index, (key, _, _) in enumerate(BUCKETS)
+    }
+
+
+def get_dashboard_buckets() -> dict[str, Bucket]:
+    """Return the overdue, today and next-7-days buckets, cached for a short time.
+
+    Each bucket holds at most ``DASHBOARD_BUCKET_LIMIT`` reminders plus the
+    total count. The cache expires after ``DASHBOARD_CACHE_SECONDS`` and is
+    dropped on every committed change to reminders, clients or policies in
+    this process; other processes catch up when their entry expires.
+    """
+    global _cached
+
+    today = _local_now_naive().date()
+    entry = _cached
+    if entry is not None and entry.day == today and entry.expires_at > monotonic():
+        return entry.buckets
+
+    version = _version
+    buckets = _load_buckets(today, max(1, current_app.config["DASHBOARD_BUCKET_LIMIT"]))
+    ttl = current_app.config["DASHBOARD_CACHE_SECONDS"]
+    with _lock:
+        # Skip storing if a write was committed while the buckets were loading.
+        if ttl > 0 and version == _version:
+            _cached = _CacheEntry(day=today, expires_at=monotonic() + ttl, buckets=buckets)
+    return buckets
+
+
+def invalidate_dashboard() -> None:
+    """Drop the cached buckets; call after bulk writes that bypass the ORM."""
+    global _cached, _version
+
+    with _lock:
+        _version += 1
+        _cached = None
+
+
+@event.listens_for(Session, "after_flush")
+def _track_dashboard_changes(session: Session, flush_context: Any) -> None:
+    changed = (*session.new, *session.dirty, *session.deleted)
+    if any(isinstance(instance, (Reminder, Client, Policy)) for instance in changed):
+        session.info[_SESSION_FLAG] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session: Session) -> None:
+    if session.info.pop(_SESSION_FLAG, False):
+        invalidate_dashboard()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_on_rollback(session: Session) -> None:
+    session.info.pop(_SESSION_FLAG, None)
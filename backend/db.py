@@ -1,19 +1,62 @@
 from __future__ import annotations
 
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Any, Iterator, Mapping
 from urllib.parse import unquote, urlparse
 
 from flask import Flask
+from sqlalchemy import Column, MetaData, Table, delete, event, insert, select, text
+from sqlalchemy.engine import Engine, make_url
 
 from backend.config import BASE_DIR, Config
+from backend.migrations import run_migrations, schema_transaction
 from backend.models import db
 
 
-def _resolve_sqlite_path(database_url: str | None = None) -> Path:
+# Arbitrary constant shared by every process that creates or migrates the schema.
+_SCHEMA_LOCK_KEY = 72_517_001
+
+
+def normalize_database_url(database_url: str) -> str:
+    """Accept the ``postgres://`` scheme many hosting providers still hand out."""
+    if database_url.startswith("postgres://"):
+        return "postgresql://" + database_url[len("postgres://") :]
+    return database_url
+
+
+def is_sqlite_url(database_url: str) -> bool:
+    return make_url(database_url).get_backend_name() == "sqlite"
+
+
+def engine_options(config: Mapping[str, Any]) -> dict[str, Any]:
+    """Return ``SQLALCHEMY_ENGINE_OPTIONS`` for the configured database."""
+    options = dict(config.get("SQLALCHEMY_ENGINE_OPTIONS") or {})
+    if is_sqlite_url(config["SQLALCHEMY_DATABASE_URI"]):
+        return options
+
+    options.setdefault("pool_size", int(config["DB_POOL_SIZE"]))
+    options.setdefault("max_overflow", int(config["DB_MAX_OVERFLOW"]))
+    options.setdefault("pool_timeout", int(config["DB_POOL_TIMEOUT"]))
+    options.setdefault("pool_recycle", int(config["DB_POOL_RECYCLE"]))
+    options.setdefault("pool_pre_ping", bool(config["DB_POOL_PRE_PING"]))
+    return options
+
+
+def configure_database(app: Flask) -> None:
+    """Normalize the database URL and set pool options before ``db.init_app``."""
+    app.config["SQLALCHEMY_DATABASE_URI"] = normalize_database_url(
+        app.config["SQLALCHEMY_DATABASE_URI"]
+    )
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options(app.config)
+
+
+def resolve_sqlite_path(database_url: str | None = None) -> Path:
+    """Return the file path of a SQLite URL (the configured database by default)."""
     url = database_url or Config.SQLALCHEMY_DATABASE_URI
+    if not is_sqlite_url(url):
+        raise ValueError("Not a SQLite database URL.")
     parsed = urlparse(url)
-    if parsed.scheme != "sqlite":
-        raise ValueError("Only sqlite databases are supported for initialization.")
 
     raw_path = unquote(parsed.path)
     if not raw_path:
@@ -26,18 +69,156 @@ def _resolve_sqlite_path(database_url: str | None = None) -> Path:
     return db_path
 
 
-def init_db(database_url: str | None = None) -> Path:
-    """Initialize the SQLite database and create required tables."""
-    db_path = _resolve_sqlite_path(database_url)
-    db_path.parent.mkdir(parents=True, exist_ok=True)
+_JOURNAL_MODES = {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"}
+_SYNCHRONOUS_LEVELS = {"OFF", "NORMAL", "FULL", "EXTRA"}
+_TEMP_STORES = {"DEFAULT", "FILE", "MEMORY"}
+
+
+def _choice(value: Any, allowed: set[str], name: str) -> str:
+    value = str(value).upper()
+    if value not in allowed:
+        raise ValueError(f"Unsupported {name}: {value}")
+    return value
+
+
+def _sqlite_pragmas(config: Mapping[str, Any]) -> list[str]:
+    return [
+        f"PRAGMA journal_mode={_choice(config['SQLITE_JOURNAL_MODE'], _JOURNAL_MODES, 'SQLITE_JOURNAL_MODE')}",
+        f"PRAGMA synchronous={_choice(config['SQLITE_SYNCHRONOUS'], _SYNCHRONOUS_LEVELS, 'SQLITE_SYNCHRONOUS')}",
+        f"PRAGMA busy_timeout={int(config['SQLITE_BUSY_TIMEOUT_MS'])}",
+        # A negative cache_size is interpreted by SQLite as KiB rather than pages.
+        f"PRAGMA cache_size={-abs(int(config['SQLITE_CACHE_SIZE_KB']))}",
+        f"PRAGMA mmap_size={int(config['SQLITE_MMAP_SIZE'])}",
+        f"PRAGMA temp_store={_choice(config['SQLITE_TEMP_STORE'], _TEMP_STORES, 'SQLITE_TEMP_STORE')}",
+    ]
+
+
+def configure_engine(engine: Engine, config: Mapping[str, Any]) -> None:
+    """Apply the SQLite tuning profile from ``config`` to every new connection."""
+    if engine.dialect.name != "sqlite":
+        return
+
+    pragmas = _sqlite_pragmas(config)
+
+    @event.listens_for(engine, "connect")
+    def _apply_pragmas(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
 
+@contextmanager
+def _schema_lock(engine: Engine) -> Iterator[None]:
+    """Serialize schema setup when several workers start against one server database.
+
+    SQLite has no equivalent; there every step runs in ``schema_transaction``.
+    """
+    if engine.dialect.name != "postgresql":
+        yield
+        return
+
+    with engine.connect() as connection:
+        connection.execute(text("SELECT pg_advisory_lock(:key)"), {"key": _SCHEMA_LOCK_KEY})
+        connection.commit()
+        try:
+            yield
+        finally:
+            connection.execute(
+                text("SELECT pg_advisory_unlock(:key)"), {"key": _SCHEMA_LOCK_KEY}
+            )
+            connection.commit()
+
+
+def prepare_schema(engine: Engine) -> None:
+    """Create missing tables and apply pending migrations."""
+    with _schema_lock(engine):
+        with schema_transaction(engine) as connection:
+            db.metadata.create_all(bind=connection)
+        run_migrations(engine)
+
+
+_staging_metadata = MetaData()
+_staging_tables: dict[tuple[str, tuple[str, ...]], Table] = {}
+
+
+def _staging_table(table: Table, columns: tuple[str, ...]) -> Table:
+    key = (table.name, columns)
+    if key not in _staging_tables:
+        suffix = "_with_id" if "id" in columns else ""
+        _staging_tables[key] = Table(
+            f"bulk_staging_{table.name}{suffix}",
+            _staging_metadata,
+            *(Column(name, table.c[name].type) for name in columns),
+            prefixes=["TEMPORARY"],
+        )
+    return _staging_tables[key]
+
+
+def bulk_insert(table: Table, values: list[dict[str, Any]]) -> None:
+    """Insert ``values`` into ``table`` within the current ``db.session`` transaction."""
+    if db.session.get_bind().dialect.name != "sqlite":
+        db.session.execute(insert(table), values)
+        return
+
+    # SQLite runs the FTS sync triggers inside each statement, and FTS5 flushes
+    # its index at the end of every one, so a plain executemany costs a flush
+    # per row. Staging the batch in a temp table and copying it with a single
+    # INSERT ... SELECT flushes once per batch (about 3x faster).
+    staging = _staging_table(table, tuple(values[0]))
+    staging.create(bind=db.session.connection(), checkfirst=True)
+    db.session.execute(insert(staging), values)
+    db.session.execute(
+        insert(table).from_select(list(staging.c.keys()), select(*staging.c))
+    )
+    db.session.execute(delete(staging))
+
+
+def sync_id_sequence(model) -> None:
+    """Move the PostgreSQL id sequence of ``model`` past explicitly inserted ids."""
+    if db.engine.dialect.name != "postgresql":
+        return
+    table = model.__tablename__
+    db.session.execute(
+        text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+            f"COALESCE((SELECT MAX(id) FROM {table}), 1))"
+        )
+    )
+    db.session.commit()
+
+
+def init_db(database_url: str | None = None) -> Path | str:
+    """Initialize the database and create required tables.
+
+    Returns the SQLite file path, or the URL (without password) for a server
+    database such as PostgreSQL.
+    """
+    url = normalize_database_url(database_url or Config.SQLALCHEMY_DATABASE_URI)
+    location: Path | str
+    if is_sqlite_url(url):
+        location = resolve_sqlite_path(url)
+        location.parent.mkdir(parents=True, exist_ok=True)
+    else:
+        location = make_url(url).render_as_string(hide_password=True)
+
+    create_db_app(url)
+    return location
+
+
+def create_db_app(database_url: str | None = None) -> Flask:
+    """Build a minimal app bound to the database, for scripts (no routes or scheduler)."""
     app = Flask(__name__)
     app.config.from_object(Config)
     if database_url:
         app.config["SQLALCHEMY_DATABASE_URI"] = database_url
+    configure_database(app)
     db.init_app(app)
 
     with app.app_context():
-        db.create_all()
+        configure_engine(db.engine, app.config)
+        prepare_schema(db.engine)
 
-    return db_path
+    return app
@@ -1,117 +1,126 @@
 from __future__ import annotations
 
+from contextlib import contextmanager
 import logging
 import smtplib
 from email.message import EmailMessage
-from typing import Any, Mapping
+from typing import Any, Iterator, Mapping
 
-from flask import current_app, has_app_context
-
-from backend.config import Config
-from backend.models import UserConfig
+from backend.user_settings import get_settings
 
 
 logger = logging.getLogger(__name__)
 
 
-def _get_config_value(
-    user_config: UserConfig | None,
-    app_config: Mapping[str, Any] | Config,
-    app_key: str,
-    user_key: str | None = None,
-    default: Any | None = None,
-) -> Any:
-    if user_config is not None and user_key:
-        value = getattr(user_config, user_key, None)
-        if value not in (None, ""):
-            return value
-
-    if isinstance(app_config, Mapping):
-        value = app_config.get(app_key)
-    else:
-        value = getattr(app_config, app_key, None)
+class SMTPMailer:
+    """Keeps one SMTP connection open across many messages.
 
-    if value not in (None, ""):
-        return value
+    The connection is opened lazily on the first send and re-established once
+    per message if the server has dropped it in the meantime.
+    """
 
-    return default
+    def __init__(self, settings: Mapping[str, Any]) -> None:
+        self.settings = settings
+        self._smtp: smtplib.SMTP | None = None
 
+    def _connect(self) -> smtplib.SMTP:
+        server = self.settings["server"]
+        port = self.settings["port"]
+        username = self.settings["username"]
+        password = self.settings["password"]
 
-def _load_smtp_settings() -> dict[str, Any]:
-    app_config: Mapping[str, Any] | Config
-    if has_app_context():
-        app_config = current_app.config
+        smtp = smtplib.SMTP(server, port, timeout=10)
         try:
-            user_config = UserConfig.query.first()
-        except Exception:
-            logger.exception("Failed to load UserConfig for SMTP settings")
-            user_config = None
-    else:
-        app_config = Config
-        user_config = None
-
-    mail_server = _get_config_value(user_config, app_config, "MAIL_SERVER", "mail_server")
-    mail_port = int(
-        _get_config_value(user_config, app_config, "MAIL_PORT", "mail_port", Config.MAIL_PORT)
-    )
-    mail_use_tls = bool(
-        _get_config_value(
-            user_config, app_config, "MAIL_USE_TLS", "mail_use_tls", Config.MAIL_USE_TLS
-        )
-    )
-    mail_username = _get_config_value(
-        user_config, app_config, "MAIL_USERNAME", "mail_username", Config.MAIL_USERNAME
-    )
-    mail_password = _get_config_value(
-        user_config, app_config, "MAIL_PASSWORD", "mail_password", Config.MAIL_PASSWORD
-    )
-    default_sender = _get_config_value(
-        user_config,
-        app_config,
-        "MAIL_DEFAULT_SENDER",
-        "email",
-        Config.MAIL_DEFAULT_SENDER,
-    )
-
-    return {
-        "server": mail_server,
-        "port": mail_port,
-        "use_tls": mail_use_tls,
-        "username": mail_username,
-        "password": mail_password,
-        "default_sender": default_sender,
-    }
-
-
-def send_email(subject: str, body: str, to_addr: str) -> bool:
-    settings = _load_smtp_settings()
-    server = settings["server"]
-    port = settings["port"]
-    use_tls = settings["use_tls"]
-    username = settings["username"]
-    password = settings["password"]
-    default_sender = settings["default_sender"]
-
-    if not server:
-        logger.error("SMTP server is not configured; cannot send email to %s", to_addr)
-        return False
-
-    message = EmailMessage()
-    message["Subject"] = subject
-    message["From"] = default_sender
-    message["To"] = to_addr
-    message.set_content(body)
-
-    try:
-        with smtplib.SMTP(server, port, timeout=10) as smtp:
             smtp.ehlo()
-            if use_tls or port == 587:
+            if self.settings["use_tls"] or port == 587:
                 smtp.starttls()
                 smtp.ehlo()
             if username and password:
                 smtp.login(username, password)
-            smtp.send_message(message)
-        return True
-    except (smtplib.SMTPException, OSError):
-        logger.exception("Failed to send email to %s via %s:%s", to_addr, server, port)
+        except Exception:
+            smtp.close()
+            raise
+        return smtp
+
+    def _build_message(self, subject: str, body: str, to_addr: str) -> EmailMessage:
+        message = EmailMessage()
+        message["Subject"] = subject
+        message["From"] = self.settings["default_sender"]
+        message["To"] = to_addr
+        message.set_content(body)
+        return message
+
+    def send(self, subject: str, body: str, to_addr: str) -> bool:
+        server = self.settings["server"]
+        port = self.settings["port"]
+
+        if not server:
+            logger.error("SMTP server is not configured; cannot send email to %s", to_addr)
+            return False
+
+        message = self._build_message(subject, body, to_addr)
+
+        for attempt in range(2):
+            try:
+                if self._smtp is None:
+                    self._smtp = self._connect()
+                self._smtp.send_message(message)
+                return True
+            except smtplib.SMTPServerDisconnected:
+                self._discard()
+                if attempt == 0:
+                    logger.info("SMTP connection to %s:%s lost; reconnecting", server, port)
+                    continue
+                logger.exception("Failed to send email to %s via %s:%s", to_addr, server, port)
+            except smtplib.SMTPException:
+                # SMTPException subclasses OSError; server replies are not retried.
+                logger.exception("Failed to send email to %s via %s:%s", to_addr, server, port)
+                break
+            except OSError:
+                self._discard()
+                if attempt == 0:
+                    logger.info("SMTP connection to %s:%s failed; reconnecting", server, port)
+                    continue
+                logger.exception("Failed to send email to %s via %s:%s", to_addr, server, port)
         return False
+
+    def _discard(self) -> None:
+        smtp, self._smtp = self._smtp, None
+        if smtp is None:
+            return
+        try:
+            smtp.close()
+        except OSError:
+            pass
+
+    def close(self) -> None:
+        smtp, self._smtp = self._smtp, None
+        if smtp is None:
+            return
+        try:
+            smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            try:
+                smtp.close()
+            except OSError:
+                pass
+
+
+def load_smtp_settings() -> Mapping[str, Any]:
+    """Resolve SMTP settings so they can be handed to threads without app context."""
+    return get_settings().smtp
+
+
+@contextmanager
+def mail_session(settings: Mapping[str, Any] | None = None) -> Iterator[SMTPMailer]:
+    """Yield an :class:`SMTPMailer` that is closed when the block exits."""
+    mailer = SMTPMailer(settings if settings is not None else load_smtp_settings())
+    try:
+        yield mailer
+    finally:
+        mailer.close()
+
+
+def send_email(subject: str, body: str, to_addr: str) -> bool:
+    with mail_session() as mailer:
+        return mailer.send(subject, body, to_addr)
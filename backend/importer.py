@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+import csv
+from dataclasses import dataclass
+from datetime import datetime
+import logging
+from typing import Any, Callable, Iterable, Iterator, TextIO
+
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+
+from backend.db import bulk_insert, sync_id_sequence
+from backend.models import Client, Policy, db
+from backend.routes.utils import clean_str, parse_date, parse_decimal, to_int, validate_email
+from backend.summaries import refresh_client_summaries
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 2000
+
+CLIENT_COLUMNS = ("imie", "nazwisko")
+POLICY_COLUMNS = ("numer_polisy", "data_poczatku", "client_id")
+
+ErrorCallback = Callable[[int, str, dict[str, str]], None]
+
+
+class CSVImportError(ValueError):
+    """Raised when a file cannot be imported at all (e.g. missing columns)."""
+
+
+@dataclass
+class ImportResult:
+    inserted: int = 0
+    failed: int = 0
+
+
+@dataclass
+class _Row:
+    line: int
+    raw: dict[str, str]
+    values: dict[str, Any]
+
+
+def _read_rows(stream: TextIO, required: Iterable[str]) -> Iterator[tuple[int, dict[str, str]]]:
+    reader = csv.DictReader(stream)
+    header = [clean_str(name) for name in reader.fieldnames or []]
+    missing = [name for name in required if name not in header]
+    if missing:
+        raise CSVImportError(f"Brak wymaganych kolumn: {', '.join(missing)}.")
+    reader.fieldnames = header
+    for raw in reader:
+        row = {key: clean_str(value) for key, value in raw.items() if key is not None}
+        if any(row.values()):
+            yield reader.line_num, row
+
+
+def _batched(
+    rows: Iterator[tuple[int, dict[str, str]]], size: int
+) -> Iterator[list[tuple[int, dict[str, str]]]]:
+    batch: list[tuple[int, dict[str, str]]] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _parse_created_at(value: str) -> datetime:
+    # Export writes str(datetime), e.g. "2024-01-31 08:15:00.123456".
+    return datetime.fromisoformat(value) if value else datetime.utcnow()
+
+
+def _validate_client(raw: dict[str, str]) -> tuple[dict[str, Any] | None, str | None]:
+    if not raw.get("imie"):
+        return None, "Imię jest wymagane."
+    if not raw.get("nazwisko"):
+        return None, "Nazwisko jest wymagane."
+    if not validate_email(raw.get("email")):
+        return None, "Podaj poprawny adres e-mail."
+    try:
+        client_id = to_int(raw.get("id"))
+        created_at = _parse_created_at(raw.get("data_utworzenia", ""))
+    except ValueError:
+        return None, "Nieprawidłowe ID lub data utworzenia."
+
+    values = {
+        "imie": raw["imie"],
+        "nazwisko": raw["nazwisko"],
+        "email": raw.get("email") or None,
+        "telefon": raw.get("telefon") or None,
+        "adres": raw.get("adres") or None,
+        "data_utworzenia": created_at,
+    }
+    if client_id is not None:
+        values["id"] = client_id
+    return values, None
+
+
+def _validate_policy(raw: dict[str, str]) -> tuple[dict[str, Any] | None, str | None]:
+    if not raw.get("numer_polisy"):
+        return None, "Numer polisy jest wymagany."
+    if not raw.get("data_poczatku"):
+        return None, "Data początku jest wymagana."
+    if not raw.get("client_id"):
+        return None, "Wybierz klienta."
+
+    try:
+        data_poczatku = parse_date(raw["data_poczatku"])
+    except ValueError:
+        return None, "Podaj poprawną datę początku."
+    try:
+        data_konca = parse_date(raw.get("data_konca"))
+    except ValueError:
+        return None, "Podaj poprawną datę końca."
+    if data_poczatku and data_konca and data_konca < data_poczatku:
+        return None, "Data końca nie może być wcześniejsza niż początek."
+    try:
+        skladka = parse_decimal(raw.get("skladka"))
+    except ValueError:
+        return None, "Podaj poprawną składkę."
+    try:
+        client_id = to_int(raw["client_id"])
+        policy_id = to_int(raw.get("id"))
+    except ValueError:
+        return None, "Nieprawidłowe ID klienta lub polisy."
+
+    values = {
+        "numer_polisy": raw["numer_polisy"],
+        "produkt": raw.get("produkt") or None,
+        "data_poczatku": data_poczatku,
+        "data_konca": data_konca,
+        "skladka": skladka,
+        "status": raw.get("status") or None,
+        "client_id": client_id,
+    }
+    if policy_id is not None:
+        values["id"] = policy_id
+    return values, None
+
+
+def _existing(column, values: set[Any]) -> set[Any]:
+    if not values:
+        return set()
+    return set(db.session.scalars(select(column).where(column.in_(values))))
+
+
+def _drop_duplicate_ids(model, rows: list[_Row], reject: Callable[[_Row, str], None]) -> list[_Row]:
+    ids = {row.values["id"] for row in rows if "id" in row.values}
+    taken = _existing(model.id, ids)
+    kept: list[_Row] = []
+    seen: set[int] = set()
+    for row in rows:
+        row_id = row.values.get("id")
+        if row_id is not None and (row_id in taken or row_id in seen):
+            reject(row, "Rekord o tym ID już istnieje.")
+            continue
+        if row_id is not None:
+            seen.add(row_id)
+        kept.append(row)
+    return kept
+
+
+def _refresh_summaries(table, rows: list[_Row]) -> None:
+    # Bulk inserts bypass the ORM flush hook that maintains client_summaries.
+    if "client_id" in table.c:
+        refresh_client_summaries(
+            db.session.connection(), (row.values["client_id"] for row in rows)
+        )
+
+
+def _insert_batch(model, rows: list[_Row], reject: Callable[[_Row, str], None]) -> int:
+    """Insert ``rows`` in bulk, one statement set per key set, in one transaction."""
+    if not rows:
+        return 0
+    table = model.__table__
+    with_id = [row.values for row in rows if "id" in row.values]
+    without_id = [row.values for row in rows if "id" not in row.values]
+    try:
+        for group in (with_id, without_id):
+            if group:
+                bulk_insert(table, group)
+        _refresh_summaries(table, rows)
+        db.session.commit()
+        return len(rows)
+    except IntegrityError:
+        # Something changed concurrently; retry row by row to find the culprit.
+        db.session.rollback()
+
+    inserted = 0
+    for row in rows:
+        try:
+            with db.session.begin_nested():
+                db.session.execute(insert(table), [row.values])
+            inserted += 1
+        except IntegrityError:
+            reject(row, "Rekord narusza ograniczenia bazy danych.")
+    _refresh_summaries(table, rows)
+    db.session.commit()
+    return inserted
+
+
+def _run_import(
+    model,
+    stream: TextIO,
+    required: Iterable[str],
+    validate: Callable[[dict[str, str]], tuple[dict[str, Any] | None, str | None]],
+    check_batch: Callable[[list[_Row], Callable[[_Row, str], None]], list[_Row]],
+    on_error: ErrorCallback | None,
+    batch_size: int,
+) -> ImportResult:
+    result = ImportResult()
+
+    def reject(row: _Row, message: str) -> None:
+        result.failed += 1
+        if on_error is not None:
+            on_error(row.line, message, row.raw)
+
+    imported_ids = False
+    for batch in _batched(_read_rows(stream, required), max(1, batch_size)):
+        valid: list[_Row] = []
+        for line, raw in batch:
+            values, error = validate(raw)
+            row = _Row(line=line, raw=raw, values=values or {})
+            if error:
+                reject(row, error)
+            else:
+                valid.append(row)
+
+        valid = check_batch(_drop_duplicate_ids(model, valid, reject), reject)
+        imported_ids = imported_ids or any("id" in row.values for row in valid)
+        result.inserted += _insert_batch(model, valid, reject)
+        # Rows are plain dicts, but keep the identity map empty on long imports.
+        db.session.expunge_all()
+
+    if imported_ids:
+        sync_id_sequence(model)
+    logger.info(
+        "Imported %s %s rows (%s rejected)", result.inserted, model.__tablename__, result.failed
+    )
+    return result
+
+
+def import_clients(
+    stream: TextIO, on_error: ErrorCallback | None = None, batch_size: int = DEFAULT_BATCH_SIZE
+) -> ImportResult:
+    """Stream clients from CSV (the ``/export/clients.csv`` layout) into the database.
+
+    Rows are validated like the client form and inserted in batches, one
+    transaction per batch. Invalid rows are skipped and passed to ``on_error``
+    as ``(line_number, message, row)``. An ``id`` column, if filled, is kept so
+    a matching policy file can reference the same clients.
+    """
+
+    def check_batch(rows: list[_Row], reject: Callable[[_Row, str], None]) -> list[_Row]:
+        return rows
+
+    return _run_import(
+        Client, stream, CLIENT_COLUMNS, _validate_client, check_batch, on_error, batch_size
+    )
+
+
+def import_policies(
+    stream: TextIO, on_error: ErrorCallback | None = None, batch_size: int = DEFAULT_BATCH_SIZE
+) -> ImportResult:
+    """Stream policies from CSV (the ``/export/policies.csv`` layout) into the database.
+
+    Besides the policy form's checks, each batch is checked with one query for
+    already used policy numbers and one for unknown clients.
+    """
+    known_clients: set[int] = set()
+
+    def check_batch(rows: list[_Row], reject: Callable[[_Row, str], None]) -> list[_Row]:
+        numbers = {row.values["numer_polisy"] for row in rows}
+        taken = _existing(Policy.numer_polisy, numbers)
+        client_ids = {row.values["client_id"] for row in rows} - known_clients
+        known_clients.update(_existing(Client.id, client_ids))
+
+        kept: list[_Row] = []
+        seen: set[str] = set()
+        for row in rows:
+            number = row.values["numer_polisy"]
+            if number in taken or number in seen:
+                reject(row, "Taki numer polisy już istnieje.")
+            elif row.values["client_id"] not in known_clients:
+                reject(row, "Wybrany klient nie istnieje.")
+            else:
+                seen.add(number)
+                kept.append(row)
+        return kept
+
+    return _run_import(
+        Policy, stream, POLICY_COLUMNS, _validate_policy, check_batch, on_error, batch_size
+    )
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, field
+import logging
+import time
+
+from flask import Flask, Response, current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+logger = logging.getLogger(__name__)
+
+_STATEMENT_PREVIEW = 200
+
+
+@dataclass
+class RequestStats:
+    """SQL activity of one request, kept in ``flask.g.sql_stats``."""
+
+    started: float = field(default_factory=time.perf_counter)
+    queries: int = 0
+    sql_seconds: float = 0.0
+    statements: Counter = field(default_factory=Counter)
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Statements executed at least ``threshold`` times (likely N+1 lazy loads)."""
+        return [
+            (statement, count)
+            for statement, count in self.statements.most_common()
+            if count >= threshold
+        ]
+
+
+def current_stats() -> RequestStats | None:
+    if not has_request_context():
+        return None
+    return g.get("sql_stats")
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if context is not None and current_stats() is not None:
+        context._instrumentation_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = current_stats()
+    started = getattr(context, "_instrumentation_started", None)
+    if stats is None or started is None:
+        return
+    stats.queries += 1
+    stats.sql_seconds += time.perf_counter() - started
+    # Lazy loads reuse the same SQL text with different parameters, so equal
+    # statements within one request point at an N+1 pattern.
+    stats.statements[statement] += 1
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Attach the query counters to ``engine`` (once)."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _start_request() -> None:
+    g.sql_stats = RequestStats()
+
+
+def _add_server_timing(response: Response) -> Response:
+    stats = current_stats()
+    if stats is None:
+        return response
+    total_ms = (time.perf_counter() - stats.started) * 1000
+    sql_ms = stats.sql_seconds * 1000
+    # Streamed bodies (CSV export) query after this point; their totals are
+    # only in the log written at teardown.
+    response.headers.add(
+        "Server-Timing",
+        f'db;dur={sql_ms:.1f};desc="{stats.queries} queries", app;dur={total_ms:.1f}',
+    )
+    return response
+
+
+def _log_request(exc: BaseException | None) -> None:
+    stats = current_stats()
+    if stats is None:
+        return
+    total_ms = (time.perf_counter() - stats.started) * 1000
+    logger.debug(
+        "%s %s: %s queries, %.1f ms SQL, %.1f ms total",
+        request.method,
+        request.path,
+        stats.queries,
+        stats.sql_seconds * 1000,
+        total_ms,
+    )
+    for statement, count in stats.repeated(current_app.config["SQL_NPLUSONE_THRESHOLD"]):
+        logger.warning(
+            "Possible N+1 in %s %s: statement executed %s times: %s",
+            request.method,
+            request.path,
+            count,
+            " ".join(statement.split())[:_STATEMENT_PREVIEW],
+        )
+
+
+def init_instrumentation(app: Flask, engine: Engine) -> None:
+    """Count queries and SQL time per request.
+
+    Every request logs its totals at DEBUG level and a warning for each
+    statement repeated ``SQL_NPLUSONE_THRESHOLD`` times or more; with
+    ``SQL_SERVER_TIMING`` the numbers are also sent in a ``Server-Timing``
+    header, which browser developer tools show next to the request.
+    """
+    if not app.config["SQL_INSTRUMENTATION_ENABLED"]:
+        return
+    instrument_engine(engine)
+    app.before_request(_start_request)
+    if app.config["SQL_SERVER_TIMING"]:
+        app.after_request(_add_server_timing)
+    app.teardown_request(_log_request)
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+import os
+import socket
+from typing import Iterable, Iterator
+from uuid import uuid4
+
+from sqlalchemy import delete, insert, literal, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from backend.models import Reminder, ReminderClaim, SchedulerLease, db
+
+
+# Identifies this process in lease and claim rows.
+PROCESS_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+
+
+@contextmanager
+def _lease_session() -> Iterator[Session]:
+    """Run lease and claim writes in their own short transaction.
+
+    Committing through ``db.session`` would expire the reminders the caller has
+    just loaded and force them to be reloaded one by one.
+    """
+    session = Session(bind=db.session.get_bind(), expire_on_commit=False)
+    try:
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+def _insert_ignoring_conflicts(session: Session, model: type[db.Model]):
+    dialect = session.get_bind().dialect.name
+    if dialect == "sqlite":
+        return sqlite.insert(model).on_conflict_do_nothing()
+    if dialect == "postgresql":
+        return postgresql.insert(model).on_conflict_do_nothing()
+    return insert(model)
+
+
+def acquire_lease(name: str, ttl: timedelta, owner: str = PROCESS_ID) -> bool:
+    """Take or extend the named lease; return ``False`` if another owner holds it."""
+    now = datetime.utcnow()
+    expires_at = now + ttl
+
+    with _lease_session() as session:
+        result = session.execute(
+            update(SchedulerLease)
+            .where(
+                SchedulerLease.name == name,
+                or_(SchedulerLease.owner == owner, SchedulerLease.expires_at < now),
+            )
+            .values(owner=owner, expires_at=expires_at)
+        )
+        if result.rowcount == 1:
+            return True
+        result = session.execute(
+            _insert_ignoring_conflicts(session, SchedulerLease).values(
+                name=name, owner=owner, expires_at=expires_at
+            )
+        )
+        return result.rowcount == 1
+
+
+def release_lease(name: str, owner: str = PROCESS_ID) -> None:
+    with _lease_session() as session:
+        session.execute(
+            delete(SchedulerLease).where(
+                SchedulerLease.name == name, SchedulerLease.owner == owner
+            )
+        )
+
+
+def claim_reminders(
+    reminder_ids: Iterable[int], ttl: timedelta, owner: str = PROCESS_ID
+) -> set[int]:
+    """Atomically claim unsent reminders and return the ids this owner now holds.
+
+    Claims older than ``ttl`` are treated as abandoned by a crashed process and
+    taken over.
+    """
+    reminder_ids = list(reminder_ids)
+    if not reminder_ids:
+        return set()
+
+    now = datetime.utcnow()
+    with _lease_session() as session:
+        session.execute(
+            delete(ReminderClaim).where(
+                ReminderClaim.reminder_id.in_(reminder_ids),
+                ReminderClaim.claimed_at < now - ttl,
+            )
+        )
+        session.execute(
+            _insert_ignoring_conflicts(session, ReminderClaim).from_select(
+                ["reminder_id", "owner", "claimed_at"],
+                select(Reminder.id, literal(owner), literal(now)).where(
+                    Reminder.id.in_(reminder_ids), Reminder.wyslano.is_(False)
+                ),
+            )
+        )
+        return set(
+            session.scalars(
+                select(ReminderClaim.reminder_id).where(
+                    ReminderClaim.reminder_id.in_(reminder_ids), ReminderClaim.owner == owner
+                )
+            )
+        )
+
+
+def release_reminder_claims(reminder_ids: Iterable[int], owner: str = PROCESS_ID) -> None:
+    """Drop this owner's claims; the caller commits together with ``wyslano``."""
+    reminder_ids = list(reminder_ids)
+    if not reminder_ids:
+        return
+    db.session.execute(
+        delete(ReminderClaim).where(
+            ReminderClaim.reminder_id.in_(reminder_ids), ReminderClaim.owner == owner
+        )
+    )
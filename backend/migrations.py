@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from datetime import datetime
+import logging
+from typing import Callable, Iterator
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, insert, select
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError
+
+from backend.models import db
+from backend.summaries import refresh_client_summaries
+
+
+logger = logging.getLogger(__name__)
+
+# Kept out of db.metadata so db.create_all() never creates or touches it.
+_migration_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    _migration_metadata,
+    Column("version", Integer, primary_key=True),
+    Column("description", String(255), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+@contextmanager
+def schema_transaction(engine: Engine) -> Iterator[Connection]:
+    """``engine.begin()`` that takes SQLite's write lock before reading anything.
+
+    SQLite has no advisory locks, so ``BEGIN IMMEDIATE`` is what makes a second
+    process starting at the same time wait and then see the first one's work.
+    """
+    with engine.begin() as connection:
+        if connection.dialect.name == "sqlite":
+            while True:
+                try:
+                    connection.exec_driver_sql("BEGIN IMMEDIATE")
+                    break
+                except OperationalError as exc:
+                    # busy_timeout ran out while a long step runs elsewhere.
+                    if "locked" not in str(exc):
+                        raise
+                    logger.info("Waiting for another process to finish schema changes")
+        yield connection
+
+
+class MigrationDeferred(Exception):
+    """Raised by a step that cannot run in this environment yet.
+
+    The step is not recorded and is retried on the next start, e.g. once
+    SQLite is upgraded to a build with FTS5.
+    """
+
+
+def _create_indexes(connection: Connection, *names: str) -> None:
+    """Create model-declared indexes by name, skipping ones that already exist."""
+    indexes = {
+        index.name: index for table in db.metadata.tables.values() for index in table.indexes
+    }
+    for name in names:
+        indexes[name].create(bind=connection, checkfirst=True)
+
+
+def _add_hot_path_indexes(connection: Connection) -> None:
+    _create_indexes(
+        connection,
+        "ix_clients_nazwisko_imie",
+        "ix_policies_data_poczatku",
+        "ix_policies_data_konca",
+        "ix_events_policy_id",
+        "ix_events_data_wydarzenia",
+        "ix_reminders_policy_id",
+        "ix_reminders_wyslano_data",
+        "ix_reminders_data_przypomnienia",
+    )
+
+
+# Polish letters without a Unicode decomposition (ł) are folded by hand; the
+# unicode61 tokenizer strips the remaining diacritics (ą, ć, ę, ń, ó, ś, ź, ż).
+def _fold_sql(expression: str) -> str:
+    return f"replace(replace(coalesce({expression}, ''), 'ł', 'l'), 'Ł', 'L')"
+
+
+def _client_fts_values(alias: str) -> str:
+    return ", ".join(
+        _fold_sql(f"{alias}.{column}")
+        for column in ("imie", "nazwisko", "email", "telefon", "adres")
+    )
+
+
+def _policy_fts_values(alias: str) -> str:
+    client_name = _fold_sql(
+        f"(SELECT c.imie || ' ' || c.nazwisko FROM clients c WHERE c.id = {alias}.client_id)"
+    )
+    columns = ", ".join(
+        _fold_sql(f"{alias}.{column}") for column in ("numer_polisy", "produkt", "status")
+    )
+    return f"{columns}, {client_name}"
+
+
+def _add_full_text_search(connection: Connection) -> None:
+    if connection.dialect.name != "sqlite":
+        return
+    try:
+        connection.exec_driver_sql(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS clients_fts USING fts5("
+            "imie, nazwisko, email, telefon, adres, "
+            "tokenize = 'unicode61 remove_diacritics 2')"
+        )
+    except OperationalError as exc:
+        raise MigrationDeferred("SQLite FTS5 is not available; search falls back to LIKE") from exc
+    connection.exec_driver_sql(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS policies_fts USING fts5("
+        "numer_polisy, produkt, status, klient, "
+        "tokenize = 'unicode61 remove_diacritics 2')"
+    )
+
+    statements = [
+        f"""
+        CREATE TRIGGER IF NOT EXISTS clients_fts_ai AFTER INSERT ON clients BEGIN
+            INSERT INTO clients_fts(rowid, imie, nazwisko, email, telefon, adres)
+            VALUES (new.id, {_client_fts_values("new")});
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS clients_fts_ad AFTER DELETE ON clients BEGIN
+            DELETE FROM clients_fts WHERE rowid = old.id;
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS clients_fts_au AFTER UPDATE ON clients BEGIN
+            DELETE FROM clients_fts WHERE rowid = old.id;
+            INSERT INTO clients_fts(rowid, imie, nazwisko, email, telefon, adres)
+            VALUES (new.id, {_client_fts_values("new")});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS clients_fts_au_policies
+        AFTER UPDATE OF imie, nazwisko ON clients BEGIN
+            DELETE FROM policies_fts
+            WHERE rowid IN (SELECT id FROM policies WHERE client_id = new.id);
+            INSERT INTO policies_fts(rowid, numer_polisy, produkt, status, klient)
+            SELECT p.id, {_policy_fts_values("p")} FROM policies p WHERE p.client_id = new.id;
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS policies_fts_ai AFTER INSERT ON policies BEGIN
+            INSERT INTO policies_fts(rowid, numer_polisy, produkt, status, klient)
+            VALUES (new.id, {_policy_fts_values("new")});
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS policies_fts_ad AFTER DELETE ON policies BEGIN
+            DELETE FROM policies_fts WHERE rowid = old.id;
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS policies_fts_au AFTER UPDATE ON policies BEGIN
+            DELETE FROM policies_fts WHERE rowid = old.id;
+            INSERT INTO policies_fts(rowid, numer_polisy, produkt, status, klient)
+            VALUES (new.id, {_policy_fts_values("new")});
+        END
+        """,
+        "DELETE FROM clients_fts",
+        f"""
+        INSERT INTO clients_fts(rowid, imie, nazwisko, email, telefon, adres)
+        SELECT c.id, {_client_fts_values("c")} FROM clients c
+        """,
+        "DELETE FROM policies_fts",
+        f"""
+        INSERT INTO policies_fts(rowid, numer_polisy, produkt, status, klient)
+        SELECT p.id, {_policy_fts_values("p")} FROM policies p
+        """,
+    ]
+    for statement in statements:
+        connection.exec_driver_sql(statement)
+
+
+def _fill_client_summaries(connection: Connection) -> None:
+    # create_all has already created the empty table; fill it for existing data.
+    refresh_client_summaries(connection)
+
+
+def _add_client_detail_indexes(connection: Connection) -> None:
+    _create_indexes(
+        connection,
+        "ix_policies_client_data_poczatku",
+        "ix_events_client_data_wydarzenia",
+        "ix_reminders_client_data_przypomnienia",
+    )
+    # The composite indexes start with client_id and make these redundant.
+    for name in ("ix_policies_client_id", "ix_events_client_id", "ix_reminders_client_id"):
+        connection.exec_driver_sql(f"DROP INDEX IF EXISTS {name}")
+
+
+# Append new steps with the next version number; never renumber or edit
+# steps that have already shipped.
+MIGRATIONS: list[tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "Indexes for dashboard, scheduler, list and foreign key queries", _add_hot_path_indexes),
+    (2, "Full-text search for clients and policies", _add_full_text_search),
+    (3, "Per-client policy and reminder summaries", _fill_client_summaries),
+    (4, "Per-client indexes for the client detail page", _add_client_detail_indexes),
+]
+
+
+def run_migrations(engine: Engine) -> list[int]:
+    """Apply pending migrations in order and return the versions applied.
+
+    ``db.create_all()`` only creates missing tables, so schema changes to
+    existing tables (such as new indexes) are shipped as numbered steps here.
+    Each step runs in its own transaction together with its version record;
+    the version is checked again inside it, so a process that started at the
+    same time and applied the step first wins and this one skips it.
+    """
+    with schema_transaction(engine) as connection:
+        schema_migrations.create(bind=connection, checkfirst=True)
+        applied = set(connection.scalars(select(schema_migrations.c.version)))
+
+    newly_applied = []
+    for version, description, step in MIGRATIONS:
+        if version in applied:
+            continue
+        try:
+            with schema_transaction(engine) as connection:
+                if connection.scalar(
+                    select(schema_migrations.c.version).where(schema_migrations.c.version == version)
+                ) is not None:
+                    continue
+                step(connection)
+                connection.execute(
+                    insert(schema_migrations).values(
+                        version=version, description=description, applied_at=datetime.utcnow()
+                    )
+                )
+        except MigrationDeferred as exc:
+            # Later steps do not depend on a deferred one, so they still run.
+            logger.warning("Migration %s deferred: %s", version, exc)
+            continue
+        logger.info("Applied migration %s: %s", version, description)
+        newly_applied.append(version)
+    return newly_applied
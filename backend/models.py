@@ -12,6 +12,7 @@ db = SQLAlchemy()
 
 class Client(db.Model):
     __tablename__ = "clients"
+    __table_args__ = (db.Index("ix_clients_nazwisko_imie", "nazwisko", "imie"),)
 
     id = db.Column(db.Integer, primary_key=True)
     imie = db.Column(db.String(120), nullable=False)
@@ -26,18 +27,50 @@ class Client(db.Model):
     reminders = db.relationship(
         "Reminder", back_populates="client", cascade="all, delete-orphan"
     )
+    archived_reminders = db.relationship(
+        "ReminderArchive", back_populates="client", cascade="all, delete-orphan"
+    )
+    # Maintained by backend/summaries.py; missing for clients with no policies
+    # or reminders yet.
+    summary = db.relationship(
+        "ClientSummary",
+        primaryjoin="Client.id == foreign(ClientSummary.client_id)",
+        uselist=False,
+        viewonly=True,
+    )
+
+
+class ClientSummary(db.Model):
+    """Per-client totals kept in sync on flush, so lists never walk relationships.
+
+    No foreign key: rows are derived data written only by ``backend.summaries``.
+    """
+
+    __tablename__ = "client_summaries"
+
+    client_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    liczba_polis = db.Column(db.Integer, default=0, nullable=False)
+    suma_skladek = db.Column(db.Numeric(14, 2), default=0, nullable=False)
+    # Earliest unsent reminder (may already be overdue).
+    najblizsze_przypomnienie = db.Column(db.DateTime, nullable=True)
 
 
 class Policy(db.Model):
     __tablename__ = "policies"
+    __table_args__ = (
+        db.Index("ix_policies_data_poczatku", "data_poczatku"),
+        # Client detail page: one client's policies, newest first.
+        db.Index("ix_policies_client_data_poczatku", "client_id", "data_poczatku"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     numer_polisy = db.Column(db.String(120), nullable=False, unique=True)
     produkt = db.Column(db.String(120), nullable=True)
     data_poczatku = db.Column(db.Date, nullable=False)
-    data_konca = db.Column(db.Date, nullable=True)
+    data_konca = db.Column(db.Date, nullable=True, index=True)
     skladka = db.Column(db.Numeric(12, 2), nullable=True)
     status = db.Column(db.String(50), nullable=True)
+    # Indexed by the composite (client_id, ...) index above.
     client_id = db.Column(db.Integer, db.ForeignKey("clients.id"), nullable=False)
 
     client = db.relationship("Client", back_populates="policies")
@@ -45,17 +78,28 @@ class Policy(db.Model):
     reminders = db.relationship(
         "Reminder", back_populates="policy", cascade="all, delete-orphan"
     )
+    archived_reminders = db.relationship(
+        "ReminderArchive", back_populates="policy", cascade="all, delete-orphan"
+    )
+    expiry_reminder_marks = db.relationship(
+        "ExpiryReminderMark", cascade="all, delete-orphan"
+    )
 
 
 class Event(db.Model):
     __tablename__ = "events"
+    __table_args__ = (
+        db.Index("ix_events_data_wydarzenia", "data_wydarzenia"),
+        db.Index("ix_events_client_data_wydarzenia", "client_id", "data_wydarzenia"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     tytul = db.Column(db.String(200), nullable=False)
     opis = db.Column(db.Text, nullable=True)
     data_wydarzenia = db.Column(db.DateTime, nullable=False)
+    # Indexed by the composite (client_id, ...) index above.
     client_id = db.Column(db.Integer, db.ForeignKey("clients.id"), nullable=False)
-    policy_id = db.Column(db.Integer, db.ForeignKey("policies.id"), nullable=True)
+    policy_id = db.Column(db.Integer, db.ForeignKey("policies.id"), nullable=True, index=True)
 
     client = db.relationship("Client", back_populates="events")
     policy = db.relationship("Policy", back_populates="events")
@@ -63,18 +107,86 @@ class Event(db.Model):
 
 class Reminder(db.Model):
     __tablename__ = "reminders"
+    __table_args__ = (
+        # Dashboard buckets and the scheduler filter unsent rows by date.
+        db.Index("ix_reminders_wyslano_data", "wyslano", "data_przypomnienia"),
+        db.Index("ix_reminders_data_przypomnienia", "data_przypomnienia"),
+        db.Index("ix_reminders_client_data_przypomnienia", "client_id", "data_przypomnienia"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     tresc = db.Column(db.Text, nullable=False)
     data_przypomnienia = db.Column(db.DateTime, nullable=False)
     wyslano = db.Column(db.Boolean, default=False, nullable=False)
+    # Indexed by the composite (client_id, ...) index above.
     client_id = db.Column(db.Integer, db.ForeignKey("clients.id"), nullable=True)
-    policy_id = db.Column(db.Integer, db.ForeignKey("policies.id"), nullable=True)
+    policy_id = db.Column(db.Integer, db.ForeignKey("policies.id"), nullable=True, index=True)
 
     client = db.relationship("Client", back_populates="reminders")
     policy = db.relationship("Policy", back_populates="reminders")
 
 
+class ReminderArchive(db.Model):
+    """Sent reminders moved out of ``reminders`` by the archiving job.
+
+    Rows get their own ids (SQLite may hand a deleted reminder id out again);
+    ``reminder_id`` keeps the original one so old links still resolve.
+    """
+
+    __tablename__ = "reminders_archive"
+    __table_args__ = (
+        db.Index("ix_reminders_archive_data_przypomnienia", "data_przypomnienia"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    reminder_id = db.Column(db.Integer, nullable=False, index=True)
+    tresc = db.Column(db.Text, nullable=False)
+    data_przypomnienia = db.Column(db.DateTime, nullable=False)
+    wyslano = db.Column(db.Boolean, default=True, nullable=False)
+    client_id = db.Column(db.Integer, db.ForeignKey("clients.id"), nullable=True, index=True)
+    policy_id = db.Column(db.Integer, db.ForeignKey("policies.id"), nullable=True, index=True)
+    data_archiwizacji = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    client = db.relationship("Client", back_populates="archived_reminders")
+    policy = db.relationship("Policy", back_populates="archived_reminders")
+
+
+class ExpiryReminderMark(db.Model):
+    """Policy end date that already got an automatic expiry reminder.
+
+    Outlives the reminder itself, so one edited or deleted by the user is not
+    created again; a policy extended to a new ``data_konca`` gets a new one.
+    """
+
+    __tablename__ = "expiry_reminder_marks"
+
+    policy_id = db.Column(
+        db.Integer, db.ForeignKey("policies.id"), primary_key=True, autoincrement=False
+    )
+    data_konca = db.Column(db.Date, primary_key=True)
+    data_utworzenia = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+
+class ReminderClaim(db.Model):
+    """Marks a reminder as being sent by one scheduler process."""
+
+    __tablename__ = "reminder_claims"
+
+    reminder_id = db.Column(db.Integer, primary_key=True)
+    owner = db.Column(db.String(255), nullable=False)
+    claimed_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+
+class SchedulerLease(db.Model):
+    """Time-limited lock that lets only one process run a scheduler job."""
+
+    __tablename__ = "scheduler_leases"
+
+    name = db.Column(db.String(120), primary_key=True)
+    owner = db.Column(db.String(255), nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False)
+
+
 class UserConfig(db.Model):
     __tablename__ = "user_configs"
 
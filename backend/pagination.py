@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import base64
+import binascii
+from dataclasses import dataclass
+from datetime import date, datetime
+import json
+from typing import Any, Sequence
+
+from flask_sqlalchemy.query import Query
+from sqlalchemy import and_, or_, tuple_
+from sqlalchemy.sql import ColumnElement
+
+
+@dataclass(frozen=True)
+class SortKey:
+    """One column of a list's sort order; the last key must be unique (the id)."""
+
+    column: ColumnElement
+    descending: bool = False
+
+    def order_by(self, reverse: bool) -> ColumnElement:
+        descending = self.descending != reverse
+        return self.column.desc() if descending else self.column.asc()
+
+    def after(self, value: Any, reverse: bool) -> ColumnElement:
+        descending = self.descending != reverse
+        return self.column < value if descending else self.column > value
+
+
+@dataclass
+class Page:
+    items: list[Any]
+    next_cursor: str | None
+    prev_cursor: str | None
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _decode_value(key: SortKey, value: Any) -> Any:
+    python_type = key.column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    return python_type(value)
+
+
+def encode_cursor(direction: str, values: Sequence[Any]) -> str:
+    payload = json.dumps([direction, *(_encode_value(value) for value in values)])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, keys: Sequence[SortKey]) -> tuple[str, list[Any]] | None:
+    """Return ``(direction, values)`` or ``None`` if the cursor is malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        direction, *values = json.loads(base64.urlsafe_b64decode(padded))
+        if direction not in ("next", "prev") or len(values) != len(keys):
+            return None
+        return direction, [_decode_value(key, value) for key, value in zip(keys, values)]
+    except (binascii.Error, ValueError, TypeError, UnicodeDecodeError):
+        return None
+
+
+def _keyset_filter(keys: Sequence[SortKey], values: Sequence[Any], reverse: bool) -> ColumnElement:
+    # A single row-value comparison lets SQLite walk the matching index.
+    if len({key.descending for key in keys}) == 1:
+        left = tuple_(*(key.column for key in keys))
+        right = tuple_(*values)
+        return left < right if keys[0].descending != reverse else left > right
+
+    clauses = []
+    for index, key in enumerate(keys):
+        equal = [keys[i].column == values[i] for i in range(index)]
+        clauses.append(and_(*equal, key.after(values[index], reverse)))
+    return or_(*clauses)
+
+
+def paginate(
+    query: Query, keys: Sequence[SortKey], cursor: str | None, page_size: int
+) -> Page:
+    """Return one page of ``query`` ordered by ``keys`` using keyset pagination.
+
+    Instead of ``OFFSET`` the cursor carries the sort values of the last (or
+    first) row shown, so every page costs the same no matter how deep it is.
+    """
+    decoded = decode_cursor(cursor, keys) if cursor else None
+    direction, values = decoded if decoded else ("next", None)
+    reverse = direction == "prev"
+
+    labelled = [key.column.label(f"_sort_{index}") for index, key in enumerate(keys)]
+    page_query = (
+        query.add_columns(*labelled)
+        .order_by(None)
+        .order_by(*(key.order_by(reverse) for key in keys))
+    )
+    if values is not None:
+        page_query = page_query.filter(_keyset_filter(keys, values, reverse))
+
+    rows = page_query.limit(page_size + 1).all()
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if reverse:
+        rows.reverse()
+
+    if not rows:
+        return Page(items=[], next_cursor=None, prev_cursor=None)
+
+    first_values = list(rows[0][1:])
+    last_values = list(rows[-1][1:])
+    has_next = has_more if not reverse else True
+    has_prev = has_more if reverse else values is not None
+    return Page(
+        items=[row[0] for row in rows],
+        next_cursor=encode_cursor("next", last_values) if has_next else None,
+        prev_cursor=encode_cursor("prev", first_values) if has_prev else None,
+    )
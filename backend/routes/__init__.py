@@ -7,6 +7,7 @@ from backend.routes.reminders import reminders_bp
 from backend.routes.dashboard import dashboard_bp
 from backend.routes.settings import settings_bp
 from backend.routes.export import export_bp
+from backend.routes.imports import imports_bp
 
 __all__ = [
     "clients_bp",
@@ -16,4 +17,5 @@ __all__ = [
     "dashboard_bp",
     "settings_bp",
     "export_bp",
+    "imports_bp",
 ]
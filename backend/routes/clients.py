@@ -1,40 +1,103 @@
 from __future__ import annotations
 
-from flask import Blueprint, redirect, render_template, request, url_for
-from sqlalchemy import or_
+from flask import (
+    Blueprint,
+    Response,
+    current_app,
+    jsonify,
+    redirect,
+    render_template,
+    request,
+    url_for,
+)
+from sqlalchemy.orm import joinedload, selectinload
 
 from backend.auth import auth_required
-from backend.models import Client, db
+from backend.models import Client, Event, Policy, Reminder, db
+from backend.pagination import Page, SortKey, paginate
 from backend.routes.utils import clean_str, validate_email
+from backend.search import autocomplete_clients, search_clients
 
 clients_bp = Blueprint("clients", __name__, url_prefix="/clients")
 
+# Relationships listed on the client detail page: model, sort keys and loader
+# options. Each is paginated separately, so a client with thousands of events
+# costs the same as any other.
+_SECTIONS = {
+    "policies": (
+        Policy,
+        (SortKey(Policy.data_poczatku, descending=True), SortKey(Policy.id, descending=True)),
+        (),
+    ),
+    "events": (
+        Event,
+        (SortKey(Event.data_wydarzenia, descending=True), SortKey(Event.id, descending=True)),
+        (selectinload(Event.policy),),
+    ),
+    "reminders": (
+        Reminder,
+        (
+            SortKey(Reminder.data_przypomnienia, descending=True),
+            SortKey(Reminder.id, descending=True),
+        ),
+        (selectinload(Reminder.policy),),
+    ),
+}
+
+
+def _section_page(client_id: int, section: str, cursor: str | None) -> Page:
+    model, keys, options = _SECTIONS[section]
+    # Keyset pages walk the (client_id, date) indexes; policies of the page's
+    # events and reminders arrive in one extra SELECT ... IN query.
+    query = model.query.filter(model.client_id == client_id).options(*options)
+    return paginate(query, keys, cursor, current_app.config["CLIENT_DETAIL_PAGE_SIZE"])
+
 
 @clients_bp.get("/")
 @auth_required
 def list_clients() -> str:
     search_query = clean_str(request.args.get("q"))
-    query = Client.query
+    keys = [SortKey(Client.nazwisko), SortKey(Client.imie), SortKey(Client.id)]
+    # Totals come from client_summaries instead of the policy/reminder relationships.
+    query = Client.query.options(joinedload(Client.summary))
     if search_query:
-        like_pattern = f"%{search_query}%"
-        query = query.filter(
-            or_(
-                Client.imie.ilike(like_pattern),
-                Client.nazwisko.ilike(like_pattern),
-                Client.email.ilike(like_pattern),
-                Client.telefon.ilike(like_pattern),
-                Client.adres.ilike(like_pattern),
-            )
-        )
-    clients = query.order_by(Client.nazwisko.asc(), Client.imie.asc()).all()
-    return render_template("clients/list.html", clients=clients, search_query=search_query)
+        query, rank = search_clients(query, search_query)
+        if rank is not None:
+            keys.insert(0, SortKey(rank))
+    page = paginate(
+        query, keys, request.args.get("cursor"), current_app.config["LIST_PAGE_SIZE"]
+    )
+    return render_template(
+        "clients/list.html", clients=page.items, page=page, search_query=search_query
+    )
+
+
+@clients_bp.get("/autocomplete")
+@auth_required
+def autocomplete() -> Response:
+    results, more = autocomplete_clients(
+        clean_str(request.args.get("q")), current_app.config["AUTOCOMPLETE_LIMIT"]
+    )
+    return jsonify({"results": results, "more": more})
 
 
 @clients_bp.get("/<int:client_id>")
 @auth_required
 def client_detail(client_id: int) -> str:
-    client = Client.query.get_or_404(client_id)
-    return render_template("clients/detail.html", client=client)
+    client = Client.query.options(joinedload(Client.summary)).get_or_404(client_id)
+    sections = {name: _section_page(client.id, name, None) for name in _SECTIONS}
+    return render_template(
+        "clients/detail.html", client=client, client_id=client.id, sections=sections
+    )
+
+
+@clients_bp.get("/<int:client_id>/<any(policies, events, reminders):section>")
+@auth_required
+def client_section(client_id: int, section: str) -> str:
+    """Table rows of the next page of one detail section (fetched by load_more.js)."""
+    client = db.get_or_404(Client, client_id)
+    page = _section_page(client.id, section, request.args.get("cursor"))
+    return render_template(f"clients/_{section}.html", client_id=client.id, page=page)
 
 
 @clients_bp.route("/new", methods=["GET", "POST"])
@@ -2,11 +2,14 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from flask import Blueprint, redirect, render_template, request, url_for
+from flask import Blueprint, current_app, redirect, render_template, request, url_for
+from sqlalchemy.orm import joinedload
 
 from backend.auth import auth_required
 from backend.models import Client, Event, Policy, db
+from backend.pagination import SortKey, paginate
 from backend.routes.utils import clean_str, parse_datetime, to_int
+from backend.search import picker_labels
 
 events_bp = Blueprint("events", __name__, url_prefix="/events")
 
@@ -14,8 +17,12 @@ events_bp = Blueprint("events", __name__, url_prefix="/events")
 @events_bp.get("/")
 @auth_required
 def list_events() -> str:
-    events = Event.query.order_by(Event.data_wydarzenia.desc()).all()
-    return render_template("events/list.html", events=events)
+    keys = [SortKey(Event.data_wydarzenia, descending=True), SortKey(Event.id, descending=True)]
+    query = Event.query.options(joinedload(Event.client), joinedload(Event.policy))
+    page = paginate(
+        query, keys, request.args.get("cursor"), current_app.config["LIST_PAGE_SIZE"]
+    )
+    return render_template("events/list.html", events=page.items, page=page)
 
 
 @events_bp.get("/<int:event_id>")
@@ -29,8 +36,6 @@ def event_detail(event_id: int) -> str:
 @auth_required
 def create_event() -> str:
     errors: dict[str, str] = {}
-    clients = Client.query.order_by(Client.nazwisko.asc(), Client.imie.asc()).all()
-    policies = Policy.query.order_by(Policy.numer_polisy.asc()).all()
 
     form_data = {
         "tytul": "",
@@ -104,8 +109,7 @@ def create_event() -> str:
         "events/form.html",
         form_data=form_data,
         errors=errors,
-        clients=clients,
-        policies=policies,
+        labels=picker_labels(form_data["client_id"], form_data["policy_id"]),
         mode="create",
     )
 
@@ -115,8 +119,6 @@ def create_event() -> str:
 def edit_event(event_id: int) -> str:
     event = Event.query.get_or_404(event_id)
     errors: dict[str, str] = {}
-    clients = Client.query.order_by(Client.nazwisko.asc(), Client.imie.asc()).all()
-    policies = Policy.query.order_by(Policy.numer_polisy.asc()).all()
 
     form_data = {
         "tytul": event.tytul,
@@ -187,8 +189,7 @@ def edit_event(event_id: int) -> str:
         "events/form.html",
         form_data=form_data,
         errors=errors,
-        clients=clients,
-        policies=policies,
+        labels=picker_labels(form_data["client_id"], form_data["policy_id"]),
         mode="edit",
         event=event,
     )
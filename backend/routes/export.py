@@ -2,95 +2,97 @@ from __future__ import annotations
 
 import csv
 from io import StringIO
+from typing import Iterator, Sequence
 
-from flask import Blueprint, Response
+from flask import Blueprint, Response, current_app, stream_with_context
+from sqlalchemy import Select, select
 
 from backend.auth import auth_required
-from backend.models import Client, Policy
+from backend.models import Client, Policy, db
 
 export_bp = Blueprint("export", __name__, url_prefix="/export")
 
 
-def _csv_response(filename: str, rows: list[list[str]]) -> Response:
-    buffer = StringIO()
-    writer = csv.writer(buffer)
-    writer.writerows(rows)
-    csv_data = buffer.getvalue()
-    headers = {"Content-Disposition": f"attachment; filename={filename}"}
-    return Response(csv_data, mimetype="text/csv", headers=headers)
-
-
 def _format_value(value: object | None) -> str:
     if value is None:
         return ""
     return str(value)
 
 
+def _csv_chunks(header: Sequence[str], statement: Select, chunk_size: int) -> Iterator[str]:
+    """Yield the CSV text of ``statement`` one ``chunk_size`` batch of rows at a time.
+
+    ``yield_per`` makes the driver fetch rows in batches (a server-side cursor
+    on PostgreSQL) and the rows are plain column tuples, so memory stays
+    bounded by the batch size whatever the size of the table.
+    """
+    buffer = StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    yield buffer.getvalue()
+
+    result = db.session.execute(statement.execution_options(yield_per=chunk_size))
+    for rows in result.partitions():
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([_format_value(value) for value in row] for row in rows)
+        yield buffer.getvalue()
+
+
+def _csv_response(filename: str, header: Sequence[str], statement: Select) -> Response:
+    chunks = _csv_chunks(header, statement, max(1, current_app.config["EXPORT_CHUNK_SIZE"]))
+    headers = {"Content-Disposition": f"attachment; filename={filename}"}
+    # The first bytes go out before the query finishes; stream_with_context keeps
+    # the app context (and its session) open until the last chunk is sent.
+    return Response(stream_with_context(chunks), mimetype="text/csv", headers=headers)
+
+
 @export_bp.get("/clients.csv")
 @auth_required
 def export_clients() -> Response:
-    clients = Client.query.order_by(Client.nazwisko.asc(), Client.imie.asc()).all()
-    rows = [
-        [
-            "id",
-            "imie",
-            "nazwisko",
-            "email",
-            "telefon",
-            "adres",
-            "data_utworzenia",
-        ]
-    ]
-    for client in clients:
-        rows.append(
-            [
-                _format_value(client.id),
-                _format_value(client.imie),
-                _format_value(client.nazwisko),
-                _format_value(client.email),
-                _format_value(client.telefon),
-                _format_value(client.adres),
-                _format_value(client.data_utworzenia),
-            ]
-        )
-    return _csv_response("clients.csv", rows)
+    statement = select(
+        Client.id,
+        Client.imie,
+        Client.nazwisko,
+        Client.email,
+        Client.telefon,
+        Client.adres,
+        Client.data_utworzenia,
+    ).order_by(Client.nazwisko.asc(), Client.imie.asc())
+    header = ["id", "imie", "nazwisko", "email", "telefon", "adres", "data_utworzenia"]
+    return _csv_response("clients.csv", header, statement)
 
 
 @export_bp.get("/policies.csv")
 @auth_required
 def export_policies() -> Response:
-    policies = (
-        Policy.query.join(Client)
+    # The client's name is joined into each row instead of loaded per policy.
+    statement = (
+        select(
+            Policy.id,
+            Policy.numer_polisy,
+            Policy.produkt,
+            Policy.data_poczatku,
+            Policy.data_konca,
+            Policy.skladka,
+            Policy.status,
+            Policy.client_id,
+            Client.imie,
+            Client.nazwisko,
+        )
+        .join(Client, Client.id == Policy.client_id)
         .order_by(Policy.data_poczatku.desc(), Policy.numer_polisy.asc())
-        .all()
     )
-    rows = [
-        [
-            "id",
-            "numer_polisy",
-            "produkt",
-            "data_poczatku",
-            "data_konca",
-            "skladka",
-            "status",
-            "client_id",
-            "client_imie",
-            "client_nazwisko",
-        ]
+    header = [
+        "id",
+        "numer_polisy",
+        "produkt",
+        "data_poczatku",
+        "data_konca",
+        "skladka",
+        "status",
+        "client_id",
+        "client_imie",
+        "client_nazwisko",
     ]
-    for policy in policies:
-        rows.append(
-            [
-                _format_value(policy.id),
-                _format_value(policy.numer_polisy),
-                _format_value(policy.produkt),
-                _format_value(policy.data_poczatku),
-                _format_value(policy.data_konca),
-                _format_value(policy.skladka),
-                _format_value(policy.status),
-                _format_value(policy.client_id),
-                _format_value(policy.client.imie if policy.client else None),
-                _format_value(policy.client.nazwisko if policy.client else None),
-            ]
-        )
-    return _csv_response("policies.csv", rows)
+    return _csv_response("policies.csv", header, statement)
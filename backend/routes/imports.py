@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import io
+
+from flask import Blueprint, render_template, request
+
+from backend.auth import auth_required
+from backend.importer import CSVImportError, import_clients, import_policies
+
+imports_bp = Blueprint("imports", __name__, url_prefix="/import")
+
+# Only the first errors are shown on the page; the CLI writes a full report.
+MAX_REPORTED_ERRORS = 200
+
+_IMPORTERS = {"clients": import_clients, "policies": import_policies}
+
+
+@imports_bp.route("/", methods=["GET", "POST"])
+@auth_required
+def import_view() -> str:
+    context: dict[str, object] = {"kind": "clients", "result": None, "errors": [], "message": None}
+    if request.method != "POST":
+        return render_template("import.html", **context)
+
+    kind = request.form.get("kind", "clients")
+    upload = request.files.get("file")
+    context["kind"] = kind
+    if kind not in _IMPORTERS:
+        context["message"] = "Wybierz rodzaj importu."
+        return render_template("import.html", **context), 400
+    if upload is None or not upload.filename:
+        context["message"] = "Wybierz plik CSV."
+        return render_template("import.html", **context), 400
+
+    errors: list[tuple[int, str]] = []
+
+    def on_error(line: int, message: str, row: dict[str, str]) -> None:
+        if len(errors) < MAX_REPORTED_ERRORS:
+            errors.append((line, message))
+
+    # Werkzeug spools large uploads to disk; read them as a text stream.
+    stream = io.TextIOWrapper(upload.stream, encoding="utf-8-sig", newline="")
+    try:
+        context["result"] = _IMPORTERS[kind](stream, on_error=on_error)
+    except (CSVImportError, UnicodeDecodeError, ValueError) as exc:
+        message = str(exc) if isinstance(exc, CSVImportError) else "Nie udało się odczytać pliku CSV."
+        context["message"] = message
+        return render_template("import.html", **context), 400
+
+    context["errors"] = errors
+    return render_template("import.html", **context)
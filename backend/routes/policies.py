@@ -2,12 +2,23 @@ from __future__ import annotations
 
 from datetime import date
 
-from flask import Blueprint, redirect, render_template, request, url_for
-from sqlalchemy import or_
+from flask import (
+    Blueprint,
+    Response,
+    current_app,
+    jsonify,
+    redirect,
+    render_template,
+    request,
+    url_for,
+)
+from sqlalchemy.orm import joinedload
 
 from backend.auth import auth_required
 from backend.models import Client, Policy, db
+from backend.pagination import SortKey, paginate
 from backend.routes.utils import clean_str, parse_date, parse_decimal, to_int
+from backend.search import autocomplete_policies, picker_labels, search_policies
 
 policies_bp = Blueprint("policies", __name__, url_prefix="/policies")
 
@@ -16,20 +27,31 @@ policies_bp = Blueprint("policies", __name__, url_prefix="/policies")
 @auth_required
 def list_policies() -> str:
     search_query = clean_str(request.args.get("q"))
-    query = Policy.query
+    keys = [SortKey(Policy.data_poczatku, descending=True), SortKey(Policy.id, descending=True)]
+    query = Policy.query.options(joinedload(Policy.client))
     if search_query:
-        like_pattern = f"%{search_query}%"
-        query = query.join(Client).filter(
-            or_(
-                Policy.numer_polisy.ilike(like_pattern),
-                Policy.produkt.ilike(like_pattern),
-                Policy.status.ilike(like_pattern),
-                Client.imie.ilike(like_pattern),
-                Client.nazwisko.ilike(like_pattern),
-            )
-        )
-    policies = query.order_by(Policy.data_poczatku.desc()).all()
-    return render_template("policies/list.html", policies=policies, search_query=search_query)
+        query, rank = search_policies(query, search_query)
+        if rank is not None:
+            keys.insert(0, SortKey(rank))
+    page = paginate(
+        query, keys, request.args.get("cursor"), current_app.config["LIST_PAGE_SIZE"]
+    )
+    return render_template(
+        "policies/list.html", policies=page.items, page=page, search_query=search_query
+    )
+
+
+@policies_bp.get("/autocomplete")
+@auth_required
+def autocomplete() -> Response:
+    try:
+        client_id = to_int(clean_str(request.args.get("client_id")))
+    except ValueError:
+        client_id = None
+    results, more = autocomplete_policies(
+        clean_str(request.args.get("q")), current_app.config["AUTOCOMPLETE_LIMIT"], client_id
+    )
+    return jsonify({"results": results, "more": more})
 
 
 @policies_bp.get("/<int:policy_id>")
@@ -43,7 +65,6 @@ def policy_detail(policy_id: int) -> str:
 @auth_required
 def create_policy() -> str:
     errors: dict[str, str] = {}
-    clients = Client.query.order_by(Client.nazwisko.asc(), Client.imie.asc()).all()
     form_data = {
         "numer_polisy": "",
         "produkt": "",
@@ -127,7 +148,11 @@ def create_policy() -> str:
             return redirect(url_for("policies.policy_detail", policy_id=policy.id))
 
     return render_template(
-        "policies/form.html", form_data=form_data, errors=errors, clients=clients, mode="create"
+        "policies/form.html",
+        form_data=form_data,
+        errors=errors,
+        labels=picker_labels(form_data["client_id"]),
+        mode="create",
     )
 
 
@@ -136,7 +161,6 @@ def create_policy() -> str:
 def edit_policy(policy_id: int) -> str:
     policy = Policy.query.get_or_404(policy_id)
     errors: dict[str, str] = {}
-    clients = Client.query.order_by(Client.nazwisko.asc(), Client.imie.asc()).all()
 
     form_data = {
         "numer_polisy": policy.numer_polisy,
@@ -221,7 +245,7 @@ def edit_policy(policy_id: int) -> str:
         "policies/form.html",
         form_data=form_data,
         errors=errors,
-        clients=clients,
+        labels=picker_labels(form_data["client_id"]),
         mode="edit",
         policy=policy,
     )
@@ -2,35 +2,66 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from flask import Blueprint, redirect, render_template, request, url_for
+from flask import Blueprint, abort, current_app, redirect, render_template, request, url_for
+from sqlalchemy.orm import joinedload
 
+from backend.archive import find_archived
 from backend.auth import auth_required
-from backend.models import Client, Policy, Reminder, db
+from backend.models import Client, Policy, Reminder, ReminderArchive, db
+from backend.pagination import SortKey, paginate
 from backend.routes.utils import clean_str, parse_datetime, to_int
+from backend.scheduler import schedule_next_delivery
+from backend.search import picker_labels
 
 reminders_bp = Blueprint("reminders", __name__, url_prefix="/reminders")
 
 
+def _rearm_delivery_timer() -> None:
+    schedule_next_delivery(current_app._get_current_object())
+
+
 @reminders_bp.get("/")
 @auth_required
 def list_reminders() -> str:
-    reminders = Reminder.query.order_by(Reminder.data_przypomnienia.desc()).all()
-    return render_template("reminders/list.html", reminders=reminders)
+    # ?archiwum=1 lists sent reminders moved out by the archiving job.
+    archived = request.args.get("archiwum") == "1"
+    model = ReminderArchive if archived else Reminder
+    keys = [
+        SortKey(model.data_przypomnienia, descending=True),
+        SortKey(model.id, descending=True),
+    ]
+    query = model.query.options(joinedload(model.client))
+    page = paginate(
+        query, keys, request.args.get("cursor"), current_app.config["LIST_PAGE_SIZE"]
+    )
+    return render_template(
+        "reminders/list.html", reminders=page.items, page=page, archived=archived
+    )
 
 
 @reminders_bp.get("/<int:reminder_id>")
 @auth_required
-def reminder_detail(reminder_id: int) -> str:
-    reminder = Reminder.query.get_or_404(reminder_id)
-    return render_template("reminders/detail.html", reminder=reminder)
+def reminder_detail(reminder_id: int):
+    reminder = Reminder.query.get(reminder_id)
+    if reminder is None:
+        archived = find_archived(reminder_id)
+        if archived is None:
+            abort(404)
+        return redirect(url_for("reminders.archived_reminder_detail", archive_id=archived.id))
+    return render_template("reminders/detail.html", reminder=reminder, archived=False)
+
+
+@reminders_bp.get("/archiwum/<int:archive_id>")
+@auth_required
+def archived_reminder_detail(archive_id: int) -> str:
+    reminder = ReminderArchive.query.get_or_404(archive_id)
+    return render_template("reminders/detail.html", reminder=reminder, archived=True)
 
 
 @reminders_bp.route("/new", methods=["GET", "POST"])
 @auth_required
 def create_reminder() -> str:
     errors: dict[str, str] = {}
-    clients = Client.query.order_by(Client.nazwisko.asc(), Client.imie.asc()).all()
-    policies = Policy.query.order_by(Policy.numer_polisy.asc()).all()
 
     form_data = {
         "tresc": "",
@@ -96,14 +127,14 @@ def create_reminder() -> str:
             )
             db.session.add(reminder)
             db.session.commit()
+            _rearm_delivery_timer()
             return redirect(url_for("reminders.reminder_detail", reminder_id=reminder.id))
 
     return render_template(
         "reminders/form.html",
         form_data=form_data,
         errors=errors,
-        clients=clients,
-        policies=policies,
+        labels=picker_labels(form_data["client_id"], form_data["policy_id"]),
         mode="create",
     )
 
@@ -113,8 +144,6 @@ def create_reminder() -> str:
 def edit_reminder(reminder_id: int) -> str:
     reminder = Reminder.query.get_or_404(reminder_id)
     errors: dict[str, str] = {}
-    clients = Client.query.order_by(Client.nazwisko.asc(), Client.imie.asc()).all()
-    policies = Policy.query.order_by(Policy.numer_polisy.asc()).all()
 
     form_data = {
         "tresc": reminder.tresc,
@@ -177,14 +206,14 @@ def edit_reminder(reminder_id: int) -> str:
             reminder.client_id = client_id
             reminder.policy_id = policy_id
             db.session.commit()
+            _rearm_delivery_timer()
             return redirect(url_for("reminders.reminder_detail", reminder_id=reminder.id))
 
     return render_template(
         "reminders/form.html",
         form_data=form_data,
         errors=errors,
-        clients=clients,
-        policies=policies,
+        labels=picker_labels(form_data["client_id"], form_data["policy_id"]),
         mode="edit",
         reminder=reminder,
     )
@@ -196,4 +225,5 @@ def delete_reminder(reminder_id: int) -> str:
     reminder = Reminder.query.get_or_404(reminder_id)
     db.session.delete(reminder)
     db.session.commit()
+    _rearm_delivery_timer()
     return redirect(url_for("reminders.list_reminders"))
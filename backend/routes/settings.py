@@ -8,6 +8,8 @@ from backend.auth import auth_required
 from backend.emailer import send_email
 from backend.models import UserConfig, db
 from backend.routes.utils import clean_str, to_int, validate_email
+from backend.scheduler import DAILY_JOB_ID
+from backend.user_settings import invalidate_settings
 
 
 logger = logging.getLogger(__name__)
@@ -43,11 +45,13 @@ def _build_form_data(user_config: UserConfig | None) -> dict[str, str | bool]:
 
 def _reschedule_daily_job(send_hour: int) -> None:
     scheduler = getattr(current_app, "scheduler", None)
-    if not scheduler:
+    if not scheduler or not scheduler.get_job(DAILY_JOB_ID):
+        # The scheduler runs in another process and reconciles the job with
+        # the saved send hour on its next tick.
         return
     try:
         scheduler.reschedule_job(
-            "daily_reminder_sender",
+            DAILY_JOB_ID,
             trigger="cron",
             hour=send_hour,
             minute=0,
@@ -128,6 +132,7 @@ def settings_view() -> str:
                 user_config.send_hour = send_hour
 
             db.session.commit()
+            invalidate_settings()
             _reschedule_daily_job(user_config.send_hour)
             message = "Zapisano ustawienia."
             message_type = "success"
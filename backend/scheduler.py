@@ -1,19 +1,58 @@
 from __future__ import annotations
 
-from datetime import datetime
+import atexit
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time, timedelta
+from itertools import chain
 import logging
+import sqlite3
+import threading
+from typing import Iterator
 from zoneinfo import ZoneInfo
 
+from apscheduler.jobstores.memory import MemoryJobStore
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
 from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.triggers.cron import CronTrigger
 from flask import Flask
+from sqlalchemy import and_, func, insert, or_
+from sqlalchemy.orm import joinedload
 
+from backend.archive import archive_sent_reminders
+from backend.backup import BackupError, create_backup
 from backend.config import Config
-from backend.emailer import send_email
-from backend.models import Reminder, UserConfig, db
+from backend.dashboard_data import invalidate_dashboard
+from backend.emailer import SMTPMailer, load_smtp_settings, mail_session
+from backend.leases import (
+    acquire_lease,
+    claim_reminders,
+    release_lease,
+    release_reminder_claims,
+)
+from backend.models import Client, ExpiryReminderMark, Policy, Reminder, db
+from backend.summaries import refresh_client_summaries
+from backend.user_settings import get_settings
 
 
 logger = logging.getLogger(__name__)
 
+REMINDER_SUBJECT = "Przypomnienie"
+DAILY_JOB_ID = "daily_reminder_sender"
+REALTIME_JOB_ID = "realtime_reminder_sender"
+EXPIRY_JOB_ID = "expiry_reminder_generator"
+BACKUP_JOB_ID = "database_backup"
+ARCHIVE_JOB_ID = "reminder_archiver"
+OWNER_JOB_ID = "scheduler_owner_heartbeat"
+RECONCILE_JOB_ID = "scheduler_reconciler"
+DISPATCH_LEASE = "reminder_dispatch"
+EXPIRY_LEASE = "expiry_reminders"
+BACKUP_LEASE = "database_backup"
+ARCHIVE_LEASE = "reminder_archive"
+OWNER_LEASE = "scheduler_owner"
+EXPIRY_REMINDER_PREFIX = "Wygaśnięcie polisy"
+
+_EXPIRY_BATCH_SIZE = 500
+
 
 def _get_timezone() -> ZoneInfo:
     try:
@@ -29,16 +68,33 @@ def _local_now_naive() -> datetime:
 
 def _get_send_hour(app: Flask) -> int:
     with app.app_context():
-        try:
-            user_config = UserConfig.query.first()
-        except Exception:
-            logger.exception("Failed to load UserConfig for scheduler")
-            user_config = None
+        return get_settings().send_hour
+
+
+def _client_lines(client: Client) -> list[str]:
+    lines = [f" - Imię i nazwisko: {client.imie} {client.nazwisko}"]
+    if client.email:
+        lines.append(f" - Email: {client.email}")
+    if client.telefon:
+        lines.append(f" - Telefon: {client.telefon}")
+    if client.adres:
+        lines.append(f" - Adres: {client.adres}")
+    return lines
+
 
-    send_hour = user_config.send_hour if user_config and user_config.send_hour is not None else 8
-    if not isinstance(send_hour, int) or not 0 <= send_hour <= 23:
-        return 8
-    return send_hour
+def _policy_lines(policy: Policy) -> list[str]:
+    lines = [f" - Numer polisy: {policy.numer_polisy}"]
+    if policy.produkt:
+        lines.append(f" - Produkt: {policy.produkt}")
+    if policy.data_poczatku:
+        lines.append(f" - Data początku: {policy.data_poczatku:%Y-%m-%d}")
+    if policy.data_konca:
+        lines.append(f" - Data końca: {policy.data_konca:%Y-%m-%d}")
+    if policy.skladka is not None:
+        lines.append(f" - Składka: {policy.skladka}")
+    if policy.status:
+        lines.append(f" - Status: {policy.status}")
+    return lines
 
 
 def _build_reminder_body(reminder: Reminder) -> str:
@@ -47,90 +103,777 @@ def _build_reminder_body(reminder: Reminder) -> str:
         f"Data przypomnienia: {reminder.data_przypomnienia:%Y-%m-%d %H:%M}",
     ]
     if reminder.client:
-        client = reminder.client
         lines.append("Dane klienta:")
-        lines.append(f" - Imię i nazwisko: {client.imie} {client.nazwisko}")
-        if client.email:
-            lines.append(f" - Email: {client.email}")
-        if client.telefon:
-            lines.append(f" - Telefon: {client.telefon}")
-        if client.adres:
-            lines.append(f" - Adres: {client.adres}")
+        lines.extend(_client_lines(reminder.client))
     if reminder.policy:
-        policy = reminder.policy
         lines.append("Dane polisy:")
-        lines.append(f" - Numer polisy: {policy.numer_polisy}")
-        if policy.produkt:
-            lines.append(f" - Produkt: {policy.produkt}")
-        if policy.data_poczatku:
-            lines.append(f" - Data początku: {policy.data_poczatku:%Y-%m-%d}")
-        if policy.data_konca:
-            lines.append(f" - Data końca: {policy.data_konca:%Y-%m-%d}")
-        if policy.skladka is not None:
-            lines.append(f" - Składka: {policy.skladka}")
-        if policy.status:
-            lines.append(f" - Status: {policy.status}")
+        lines.extend(_policy_lines(reminder.policy))
     return "\n".join(lines)
 
 
+class _ReminderDigest:
+    """Collects due reminders grouped by client and policy for a single email."""
+
+    def __init__(self) -> None:
+        self.reminder_ids: list[int] = []
+        # client_id -> (client lines, policy_id -> (policy lines, reminder lines))
+        self._groups: dict[
+            int | None, tuple[list[str], dict[int | None, tuple[list[str], list[str]]]]
+        ] = {}
+
+    def add(self, reminder: Reminder) -> None:
+        client_key = reminder.client_id if reminder.client else None
+        if client_key not in self._groups:
+            client_lines = (
+                [f"Klient: {reminder.client.imie} {reminder.client.nazwisko}"]
+                + _client_lines(reminder.client)
+                if reminder.client
+                else ["Bez przypisanego klienta"]
+            )
+            self._groups[client_key] = (client_lines, {})
+        policies = self._groups[client_key][1]
+
+        policy_key = reminder.policy_id if reminder.policy else None
+        if policy_key not in policies:
+            policy_lines = (
+                [f"Polisa: {reminder.policy.numer_polisy}"] + _policy_lines(reminder.policy)
+                if reminder.policy
+                else ["Bez przypisanej polisy"]
+            )
+            policies[policy_key] = (policy_lines, [])
+
+        policies[policy_key][1].append(
+            f" * {reminder.data_przypomnienia:%Y-%m-%d %H:%M} — {reminder.tresc}"
+        )
+        self.reminder_ids.append(reminder.id)
+
+    @property
+    def client_ids(self) -> set[int]:
+        return {client_id for client_id in self._groups if client_id is not None}
+
+    def render(self) -> str:
+        lines = [f"Zestawienie przypomnień: {len(self.reminder_ids)}"]
+        for client_lines, policies in self._groups.values():
+            lines.append("")
+            lines.extend(client_lines)
+            for policy_lines, reminder_lines in policies.values():
+                lines.append("")
+                lines.extend(policy_lines)
+                lines.append("Przypomnienia:")
+                lines.extend(reminder_lines)
+        return "\n".join(lines)
+
+
 def _get_agent_recipient(app: Flask) -> str | None:
     with app.app_context():
-        try:
-            user_config = UserConfig.query.first()
-        except Exception:
-            logger.exception("Failed to load UserConfig for reminder recipient")
-            user_config = None
-
-        recipient = user_config.email if user_config and user_config.email else None
+        recipient = get_settings().notification_email
         if recipient:
             return recipient
 
         return app.config.get("MAIL_DEFAULT_SENDER")
 
 
-def send_due_reminders(app: Flask) -> None:
-    with app.app_context():
-        now = _local_now_naive()
-        reminders = (
-            Reminder.query.filter(
-                Reminder.wyslano.is_(False),
-                Reminder.data_przypomnienia <= now,
+def _get_dispatch_workers(app: Flask) -> int:
+    try:
+        workers = int(app.config.get("REMINDER_DISPATCH_WORKERS", 1))
+    except (TypeError, ValueError):
+        logger.warning("Invalid REMINDER_DISPATCH_WORKERS; falling back to 1")
+        return 1
+    return max(1, workers)
+
+
+class _ReminderDispatcher:
+    """Sends rendered reminders, reusing SMTP sessions across chunks.
+
+    With more than one worker the messages are split across a thread pool, each
+    thread holding its own SMTP session. Workers never touch the database.
+    """
+
+    def __init__(self, recipient: str, workers: int) -> None:
+        self.settings = load_smtp_settings()
+        self.recipient = recipient
+        self.workers = workers
+        self._local = threading.local()
+        self._mailers: list[SMTPMailer] = []
+        self._mailers_lock = threading.Lock()
+        self._pool = (
+            ThreadPoolExecutor(max_workers=workers, thread_name_prefix="reminder-sender")
+            if workers > 1
+            else None
+        )
+
+    def __enter__(self) -> "_ReminderDispatcher":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _mailer(self) -> SMTPMailer:
+        mailer = getattr(self._local, "mailer", None)
+        if mailer is None:
+            mailer = SMTPMailer(self.settings)
+            self._local.mailer = mailer
+            with self._mailers_lock:
+                self._mailers.append(mailer)
+        return mailer
+
+    def _send_batch(self, batch: list[tuple[int, str]], sent_ids: list[int]) -> None:
+        # Successful ids are appended as they go, so the caller still sees them
+        # if a later message in the batch raises.
+        mailer = self._mailer()
+        for reminder_id, body in batch:
+            if mailer.send(REMINDER_SUBJECT, body, self.recipient):
+                sent_ids.append(reminder_id)
+
+    def send(self, messages: list[tuple[int, str]]) -> set[int]:
+        """Send rendered reminders and return the ids that were delivered."""
+        workers = min(self.workers, len(messages))
+        if self._pool is None or workers <= 1:
+            sent_ids: list[int] = []
+            try:
+                self._send_batch(messages, sent_ids)
+            except Exception:
+                logger.exception("Reminder dispatch failed")
+            return set(sent_ids)
+
+        batches = [messages[index::workers] for index in range(workers)]
+        results: list[list[int]] = [[] for _ in batches]
+        futures = [
+            self._pool.submit(self._send_batch, batch, result)
+            for batch, result in zip(batches, results)
+        ]
+        for future in futures:
+            try:
+                future.result()
+            except Exception:
+                logger.exception("Reminder dispatch worker failed")
+
+        return {reminder_id for result in results for reminder_id in result}
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+        for mailer in self._mailers:
+            mailer.close()
+
+
+def _iter_due_reminder_chunks(now: datetime, chunk_size: int) -> Iterator[list[Reminder]]:
+    """Yield due reminders in keyset-ordered chunks with client and policy loaded.
+
+    Keyset paging on ``(data_przypomnienia, id)`` keeps each chunk query cheap and
+    skips reminders that failed to send instead of fetching them again.
+    """
+    query = Reminder.query.options(
+        joinedload(Reminder.client), joinedload(Reminder.policy)
+    ).filter(
+        Reminder.wyslano.is_(False),
+        Reminder.data_przypomnienia <= now,
+    )
+    last_key: tuple[datetime, int] | None = None
+    while True:
+        chunk_query = query
+        if last_key is not None:
+            last_date, last_id = last_key
+            chunk_query = chunk_query.filter(
+                or_(
+                    Reminder.data_przypomnienia > last_date,
+                    and_(Reminder.data_przypomnienia == last_date, Reminder.id > last_id),
+                )
             )
-            .order_by(Reminder.data_przypomnienia.asc())
+        chunk = (
+            chunk_query.order_by(Reminder.data_przypomnienia.asc(), Reminder.id.asc())
+            .limit(chunk_size)
             .all()
         )
-
-        if not reminders:
-            logger.info("No reminders to send")
+        if not chunk:
             return
-
-        recipient = _get_agent_recipient(app)
-        if not recipient:
-            logger.warning("No agent email configured for reminders")
+        last_key = (chunk[-1].data_przypomnienia, chunk[-1].id)
+        yield chunk
+        if len(chunk) < chunk_size:
             return
 
-        for reminder in reminders:
 
-            subject = "Przypomnienie"
-            body = _build_reminder_body(reminder)
-            sent = send_email(subject, body, recipient)
-            if sent:
-                reminder.wyslano = True
+def _get_chunk_size(app: Flask) -> int:
+    try:
+        chunk_size = int(app.config.get("REMINDER_DISPATCH_CHUNK_SIZE", 500))
+    except (TypeError, ValueError):
+        logger.warning("Invalid REMINDER_DISPATCH_CHUNK_SIZE; falling back to 500")
+        return 500
+    return max(1, chunk_size)
+
+
+def _get_lease_ttl(app: Flask) -> timedelta:
+    try:
+        seconds = int(app.config.get("SCHEDULER_LEASE_SECONDS", 600))
+    except (TypeError, ValueError):
+        logger.warning("Invalid SCHEDULER_LEASE_SECONDS; falling back to 600")
+        seconds = 600
+    return timedelta(seconds=max(1, seconds))
+
 
+def _claim_chunk(chunk: list[Reminder], ttl: timedelta) -> list[Reminder]:
+    claimed_ids = claim_reminders((reminder.id for reminder in chunk), ttl)
+    return [reminder for reminder in chunk if reminder.id in claimed_ids]
+
+
+def _renew_dispatch_lease(ttl: timedelta) -> bool:
+    if acquire_lease(DISPATCH_LEASE, ttl):
+        return True
+    logger.warning("Reminder dispatch lease was taken over by another process; stopping")
+    return False
+
+
+def _send_reminder_digest(
+    chunks: Iterator[list[Reminder]], recipient: str, ttl: timedelta
+) -> None:
+    """Send every due reminder as one grouped email and flag them in one UPDATE."""
+    digest = _ReminderDigest()
+    lease_held = True
+    for chunk in chunks:
+        lease_held = _renew_dispatch_lease(ttl)
+        if not lease_held:
+            break
+        for reminder in _claim_chunk(chunk, ttl):
+            digest.add(reminder)
+        db.session.expunge_all()
+    # Collecting a large backlog takes a while; renew once more before sending.
+    if lease_held:
+        lease_held = _renew_dispatch_lease(ttl)
+
+    if not lease_held:
+        # Hand the claimed rows back so the new lease holder can send them.
+        release_reminder_claims(digest.reminder_ids)
         db.session.commit()
+        return
+
+    if not digest.reminder_ids:
+        return
+
+    subject = f"Przypomnienia ({len(digest.reminder_ids)})"
+    with mail_session() as mailer:
+        sent = mailer.send(subject, digest.render(), recipient)
+
+    if sent:
+        Reminder.query.filter(Reminder.id.in_(digest.reminder_ids)).update(
+            {Reminder.wyslano: True}, synchronize_session=False
+        )
+        refresh_client_summaries(db.session.connection(), digest.client_ids)
+    release_reminder_claims(digest.reminder_ids)
+    db.session.commit()
+    if sent:
+        invalidate_dashboard()
+
+
+def send_due_reminders(app: Flask) -> None:
+    with app.app_context():
+        ttl = _get_lease_ttl(app)
+        if not acquire_lease(DISPATCH_LEASE, ttl):
+            logger.info("Reminder dispatch is running in another process; skipping")
+            return
+        try:
+            _send_due_reminders(app, ttl)
+        finally:
+            db.session.rollback()
+            release_lease(DISPATCH_LEASE)
+
+
+def _send_due_reminders(app: Flask, ttl: timedelta) -> None:
+    now = _local_now_naive()
+    chunks = _iter_due_reminder_chunks(now, _get_chunk_size(app))
+
+    first_chunk = next(chunks, None)
+    if first_chunk is None:
+        logger.info("No reminders to send")
+        return
+
+    recipient = _get_agent_recipient(app)
+    if not recipient:
+        logger.warning("No agent email configured for reminders")
+        return
+
+    if app.config.get("REMINDER_DIGEST_ENABLED"):
+        _send_reminder_digest(chain([first_chunk], chunks), recipient, ttl)
+        return
+
+    with _ReminderDispatcher(recipient, _get_dispatch_workers(app)) as dispatcher:
+        for chunk in chain([first_chunk], chunks):
+            # Keep the lease alive on long runs and skip rows another process holds.
+            if not _renew_dispatch_lease(ttl):
+                break
+            claimed = _claim_chunk(chunk, ttl)
+            messages = [(reminder.id, _build_reminder_body(reminder)) for reminder in claimed]
+            sent_ids = dispatcher.send(messages) if messages else set()
+            if sent_ids:
+                Reminder.query.filter(Reminder.id.in_(sent_ids)).update(
+                    {Reminder.wyslano: True}, synchronize_session=False
+                )
+                refresh_client_summaries(
+                    db.session.connection(),
+                    (reminder.client_id for reminder in claimed if reminder.id in sent_ids),
+                )
+            release_reminder_claims(reminder.id for reminder in claimed)
+            # Commit per chunk so a crash never re-sends already flagged rows.
+            db.session.commit()
+            db.session.expunge_all()
+            if sent_ids:
+                invalidate_dashboard()
+
+
+def _expiry_reminder_text(numer_polisy: str, data_konca: date) -> str:
+    return f"{EXPIRY_REMINDER_PREFIX} {numer_polisy}: {data_konca:%Y-%m-%d}"
+
+
+def _generate_expiry_reminders() -> int:
+    settings = get_settings()
+    today = _local_now_naive().date()
+    horizon = today + timedelta(days=settings.days_before_expiry)
+    remind_time = time(hour=settings.send_hour)
+
+    candidates = (
+        db.session.query(
+            Policy.id, Policy.client_id, Policy.numer_polisy, Policy.data_konca
+        )
+        .filter(Policy.data_konca >= today, Policy.data_konca <= horizon)
+        .all()
+    )
+
+    created = 0
+    for start in range(0, len(candidates), _EXPIRY_BATCH_SIZE):
+        batch = candidates[start : start + _EXPIRY_BATCH_SIZE]
+        policy_ids = [row.id for row in batch]
+        # Marks outlive the reminders (edited, deleted or archived), so each
+        # policy end date gets exactly one automatic reminder.
+        existing = set(
+            db.session.query(ExpiryReminderMark.policy_id, ExpiryReminderMark.data_konca).filter(
+                ExpiryReminderMark.policy_id.in_(policy_ids)
+            )
+        )
+
+        rows = []
+        marks = []
+        for policy_id, client_id, numer_polisy, data_konca in batch:
+            if (policy_id, data_konca) in existing:
+                continue
+            remind_on = max(data_konca - timedelta(days=settings.days_before_expiry), today)
+            marks.append({"policy_id": policy_id, "data_konca": data_konca})
+            rows.append(
+                {
+                    "tresc": _expiry_reminder_text(numer_polisy, data_konca),
+                    "data_przypomnienia": datetime.combine(remind_on, remind_time),
+                    "wyslano": False,
+                    "client_id": client_id,
+                    "policy_id": policy_id,
+                }
+            )
+
+        if rows:
+            db.session.execute(insert(Reminder), rows)
+            db.session.execute(insert(ExpiryReminderMark), marks)
+            refresh_client_summaries(db.session.connection(), (row["client_id"] for row in rows))
+            created += len(rows)
+
+    db.session.commit()
+    return created
+
+
+def generate_expiry_reminders(app: Flask) -> int:
+    """Create missing reminders for policies expiring within the configured window.
+
+    Candidates come from a single range query on ``Policy.data_konca`` and only
+    the needed columns are fetched. Each policy end date is recorded in
+    ``expiry_reminder_marks`` and gets one reminder only, so re-running the job
+    never duplicates it and never brings back one the user edited or deleted.
+    Returns the number of reminders created.
+    """
+    with app.app_context():
+        if not acquire_lease(EXPIRY_LEASE, _get_lease_ttl(app)):
+            logger.info("Expiry reminder generation is running in another process; skipping")
+            return 0
+        try:
+            created = _generate_expiry_reminders()
+        finally:
+            db.session.rollback()
+            release_lease(EXPIRY_LEASE)
+
+    if created:
+        logger.info("Created %s policy expiry reminders", created)
+        invalidate_dashboard()
+        schedule_next_delivery(app)
+    return created
+
+
+def archive_reminders(app: Flask) -> int:
+    """Move sent reminders older than REMINDER_ARCHIVE_AFTER_DAYS to the archive."""
+    with app.app_context():
+        if not acquire_lease(ARCHIVE_LEASE, _get_lease_ttl(app)):
+            logger.info("Reminder archiving is running in another process; skipping")
+            return 0
+        try:
+            retention = timedelta(days=app.config["REMINDER_ARCHIVE_AFTER_DAYS"])
+            cutoff = _local_now_naive() - retention
+            return archive_sent_reminders(cutoff, app.config["REMINDER_ARCHIVE_BATCH_SIZE"])
+        finally:
+            db.session.rollback()
+            release_lease(ARCHIVE_LEASE)
+
 
+def backup_database(app: Flask) -> str | None:
+    """Write a rotated online snapshot of the SQLite database; see backend/backup.py."""
+    with app.app_context():
+        if db.engine.dialect.name != "sqlite":
+            logger.warning("Scheduled backups only support SQLite; skipping")
+            return None
+        if not acquire_lease(BACKUP_LEASE, _get_lease_ttl(app)):
+            logger.info("Database backup is running in another process; skipping")
+            return None
+        try:
+            path = create_backup(
+                app.config["SQLALCHEMY_DATABASE_URI"],
+                app.config["BACKUP_DIR"],
+                keep=app.config["BACKUP_KEEP"],
+                pages_per_step=app.config["BACKUP_PAGES_PER_STEP"],
+            )
+        except (BackupError, OSError, sqlite3.Error):
+            logger.exception("Database backup failed")
+            return None
+        finally:
+            release_lease(BACKUP_LEASE)
+    return str(path)
+
+
+def _is_realtime_mode(app: Flask) -> bool:
+    return str(app.config.get("REMINDER_DELIVERY_MODE", "daily")).lower() == "realtime"
+
+
+def _get_retry_delay(app: Flask) -> timedelta:
+    try:
+        seconds = int(app.config.get("REMINDER_RETRY_SECONDS", 300))
+    except (TypeError, ValueError):
+        logger.warning("Invalid REMINDER_RETRY_SECONDS; falling back to 300")
+        seconds = 300
+    return timedelta(seconds=max(1, seconds))
+
+
+# Cut-off and retry time of the last real-time run that left failed reminders.
+_pending_retry: tuple[datetime, datetime] | None = None
+
+
+def _arm_delivery_timer(
+    app: Flask, scheduler: BackgroundScheduler, after: datetime | None = None
+) -> None:
+    """Arm the one-shot job for the earliest unsent reminder.
 
-def init_scheduler(app: Flask) -> BackgroundScheduler:
-    send_hour = _get_send_hour(app)
-    scheduler = BackgroundScheduler(timezone=_get_timezone())
+    ``after`` is the cut-off of the run that just finished: anything due before
+    it that is still unsent failed to send and is retried after a delay instead
+    of re-arming the timer immediately. Re-arming between runs, after reminders
+    were changed, keeps the cut-off and retry time of the last run.
+    """
+    global _pending_retry
+
+    with app.app_context():
+        now = _local_now_naive()
+        if after is not None:
+            cutoff, retry_at = after, now + _get_retry_delay(app)
+        elif _pending_retry is not None:
+            cutoff, retry_at = _pending_retry
+        else:
+            cutoff = retry_at = None
+
+        pending = db.session.query(func.min(Reminder.data_przypomnienia)).filter(
+            Reminder.wyslano.is_(False)
+        )
+        has_failed = False
+        if cutoff is None:
+            run_at = pending.scalar()
+        else:
+            run_at = pending.filter(Reminder.data_przypomnienia > cutoff).scalar()
+            has_failed = db.session.query(
+                Reminder.query.filter(
+                    Reminder.wyslano.is_(False),
+                    Reminder.data_przypomnienia <= cutoff,
+                ).exists()
+            ).scalar()
+            if has_failed:
+                run_at = min(run_at, retry_at) if run_at else retry_at
+        if not has_failed:
+            _pending_retry = None
+        elif after is not None:
+            _pending_retry = (cutoff, retry_at)
+
+    job = scheduler.get_job(REALTIME_JOB_ID)
+    if run_at is None:
+        if job:
+            scheduler.remove_job(REALTIME_JOB_ID)
+        return
+
+    run_at = max(run_at, now)
+    if job and job.next_run_time and job.next_run_time.replace(tzinfo=None) == run_at:
+        return
     scheduler.add_job(
-        send_due_reminders,
-        "cron",
-        hour=send_hour,
-        minute=0,
-        args=[app],
-        id="daily_reminder_sender",
+        run_realtime_reminder_sender,
+        "date",
+        run_date=run_at,
+        id=REALTIME_JOB_ID,
         replace_existing=True,
+        misfire_grace_time=None,
+    )
+
+
+def deliver_due_reminders(app: Flask) -> None:
+    """Send due reminders and re-arm the timer for the next one."""
+    started = _local_now_naive()
+    try:
+        send_due_reminders(app)
+    finally:
+        scheduler = getattr(app, "scheduler", None)
+        if scheduler is not None:
+            _arm_delivery_timer(app, scheduler, after=started)
+
+
+def schedule_next_delivery(app: Flask) -> None:
+    """Re-arm the real-time delivery timer after reminders were changed."""
+    scheduler = getattr(app, "scheduler", None)
+    if scheduler is None or not _is_realtime_mode(app):
+        return
+    try:
+        _arm_delivery_timer(app, scheduler)
+    except Exception:
+        logger.exception("Failed to re-arm reminder delivery timer")
+
+
+# Jobs are stored by textual reference so they can live in a persistent job
+# store; the entry points below look the application up here.
+_app: Flask | None = None
+# Set on exit so a standby thread stops retrying the ownership lease.
+_stopping = threading.Event()
+
+
+def _get_app() -> Flask:
+    if _app is None:
+        raise RuntimeError("Scheduler has not been initialised with an application.")
+    return _app
+
+
+def run_daily_reminder_sender() -> None:
+    send_due_reminders(_get_app())
+
+
+def run_realtime_reminder_sender() -> None:
+    deliver_due_reminders(_get_app())
+
+
+def run_expiry_reminder_generator() -> None:
+    generate_expiry_reminders(_get_app())
+
+
+def run_database_backup() -> None:
+    backup_database(_get_app())
+
+
+def run_reminder_archiver() -> None:
+    archive_reminders(_get_app())
+
+
+def _build_scheduler(app: Flask) -> BackgroundScheduler:
+    try:
+        misfire_grace = int(app.config.get("SCHEDULER_MISFIRE_GRACE_SECONDS", 6 * 3600))
+    except (TypeError, ValueError):
+        logger.warning("Invalid SCHEDULER_MISFIRE_GRACE_SECONDS; falling back to 6 hours")
+        misfire_grace = 6 * 3600
+
+    jobstores = {}
+    if app.config.get("SCHEDULER_PERSISTENT_JOBS", True):
+        # Share the application's tuned engine rather than opening a second pool.
+        with app.app_context():
+            engine = db.engine
+        jobstores["default"] = SQLAlchemyJobStore(engine=engine, tablename="apscheduler_jobs")
+    # The ownership heartbeat belongs to this process only and is never stored.
+    jobstores["local"] = MemoryJobStore()
+
+    return BackgroundScheduler(
+        timezone=_get_timezone(),
+        jobstores=jobstores,
+        job_defaults={
+            # A run missed during downtime is caught up once on the next start.
+            "coalesce": True,
+            "misfire_grace_time": max(1, misfire_grace),
+            "max_instances": 1,
+        },
     )
-    scheduler.start()
+
+
+def _remove_job_if_present(scheduler: BackgroundScheduler, job_id: str) -> None:
+    if scheduler.get_job(job_id):
+        scheduler.remove_job(job_id)
+
+
+def _sync_daily_job(app: Flask, scheduler: BackgroundScheduler) -> None:
+    """Add the daily job, or move a stored one to the current send hour."""
+    trigger = CronTrigger(hour=_get_send_hour(app), minute=0, timezone=_get_timezone())
+    job = scheduler.get_job(DAILY_JOB_ID)
+    if job is None:
+        scheduler.add_job(run_daily_reminder_sender, trigger, id=DAILY_JOB_ID)
+    elif str(job.trigger) != str(trigger):
+        scheduler.reschedule_job(DAILY_JOB_ID, trigger=trigger)
+
+
+def _reconcile_jobs(app: Flask, scheduler: BackgroundScheduler) -> None:
+    """Apply changes saved by processes that do not run the scheduler.
+
+    Web workers only write to the database; a new send hour reaches the daily
+    job here, within ``SCHEDULER_RECONCILE_SECONDS`` plus the settings TTL, and
+    reminders they add or edit re-arm the real-time timer.
+    """
+    try:
+        if _is_realtime_mode(app):
+            _arm_delivery_timer(app, scheduler)
+        else:
+            _sync_daily_job(app, scheduler)
+    except Exception:
+        logger.exception("Failed to reconcile scheduler jobs")
+
+
+def _get_owner_ttl(app: Flask) -> timedelta:
+    try:
+        seconds = int(app.config.get("SCHEDULER_OWNER_LEASE_SECONDS", 60))
+    except (TypeError, ValueError):
+        logger.warning("Invalid SCHEDULER_OWNER_LEASE_SECONDS; falling back to 60")
+        seconds = 60
+    return timedelta(seconds=max(3, seconds))
+
+
+def _take_ownership(app: Flask) -> bool:
+    try:
+        with app.app_context():
+            return acquire_lease(OWNER_LEASE, _get_owner_ttl(app))
+    except Exception:
+        logger.exception("Failed to take the scheduler ownership lease")
+        return False
+
+
+def _renew_ownership(app: Flask) -> None:
+    if _take_ownership(app):
+        return
+    # Another process took over while this one was stalled; two schedulers
+    # must never share apscheduler_jobs, so step down and wait again.
+    logger.warning("Lost the scheduler ownership lease; stopping the scheduler")
+    scheduler, app.scheduler = app.scheduler, None
+    if scheduler is not None:
+        scheduler.shutdown(wait=False)
+    _stand_by(app)
+
+
+def _stand_by(app: Flask) -> None:
+    """Retry the ownership lease in the background and start the scheduler once held."""
+    interval = _get_owner_ttl(app).total_seconds() / 3
+
+    def wait_for_ownership() -> None:
+        while not _take_ownership(app):
+            if _stopping.wait(interval):
+                return
+        logger.info("Took over the scheduler ownership lease")
+        app.scheduler = _start_scheduler(app)
+
+    threading.Thread(target=wait_for_ownership, name="scheduler-standby", daemon=True).start()
+
+
+def _shutdown_scheduler(app: Flask) -> None:
+    """Stop the scheduler and hand the ownership lease over at once.
+
+    Without this a restarted process would find its own lease and stand by
+    until it expired.
+    """
+    _stopping.set()
+    scheduler, app.scheduler = getattr(app, "scheduler", None), None
+    if scheduler is not None and scheduler.running:
+        scheduler.shutdown()
+    try:
+        with app.app_context():
+            release_lease(OWNER_LEASE)
+    except Exception:
+        logger.exception("Failed to release the scheduler ownership lease")
+
+
+def init_scheduler(app: Flask) -> BackgroundScheduler | None:
+    """Start the scheduler if this process holds the ownership lease.
+
+    APScheduler 3 does not support several schedulers sharing one job store,
+    so only one process runs it; the others return ``None`` and take over
+    once the owner releases its lease on exit or stops renewing it.
+    """
+    atexit.register(_shutdown_scheduler, app)
+    if not _take_ownership(app):
+        logger.warning("Another process runs the scheduler; this one stands by")
+        _stand_by(app)
+        return None
+    return _start_scheduler(app)
+
+
+def _start_scheduler(app: Flask) -> BackgroundScheduler:
+    global _app
+    _app = app
+
+    scheduler = _build_scheduler(app)
+    # Start paused so stored jobs are inspected before any of them can fire.
+    scheduler.start(paused=True)
+
+    if app.config.get("EXPIRY_REMINDERS_ENABLED"):
+        if not scheduler.get_job(EXPIRY_JOB_ID):
+            scheduler.add_job(
+                run_expiry_reminder_generator,
+                "cron",
+                hour=0,
+                minute=5,
+                id=EXPIRY_JOB_ID,
+            )
+    else:
+        _remove_job_if_present(scheduler, EXPIRY_JOB_ID)
+
+    if app.config.get("REMINDER_ARCHIVE_ENABLED"):
+        if not scheduler.get_job(ARCHIVE_JOB_ID):
+            scheduler.add_job(
+                run_reminder_archiver,
+                "cron",
+                hour=1,
+                minute=15,
+                id=ARCHIVE_JOB_ID,
+            )
+    else:
+        _remove_job_if_present(scheduler, ARCHIVE_JOB_ID)
+
+    if app.config.get("BACKUP_ENABLED"):
+        trigger = CronTrigger(hour=app.config["BACKUP_HOUR"], minute=0, timezone=_get_timezone())
+        job = scheduler.get_job(BACKUP_JOB_ID)
+        if job is None:
+            scheduler.add_job(run_database_backup, trigger, id=BACKUP_JOB_ID)
+        elif str(job.trigger) != str(trigger):
+            scheduler.reschedule_job(BACKUP_JOB_ID, trigger=trigger)
+    else:
+        _remove_job_if_present(scheduler, BACKUP_JOB_ID)
+
+    if _is_realtime_mode(app):
+        _remove_job_if_present(scheduler, DAILY_JOB_ID)
+        _arm_delivery_timer(app, scheduler)
+    else:
+        _remove_job_if_present(scheduler, REALTIME_JOB_ID)
+        _sync_daily_job(app, scheduler)
+
+    scheduler.add_job(
+        _renew_ownership,
+        "interval",
+        seconds=_get_owner_ttl(app).total_seconds() / 3,
+        args=[app],
+        id=OWNER_JOB_ID,
+        jobstore="local",
+    )
+    scheduler.add_job(
+        _reconcile_jobs,
+        "interval",
+        seconds=max(1, int(app.config.get("SCHEDULER_RECONCILE_SECONDS", 60))),
+        args=[app, scheduler],
+        id=RECONCILE_JOB_ID,
+        jobstore="local",
+    )
+
+    scheduler.resume()
     return scheduler
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import re
+import threading
+import unicodedata
+
+from flask_sqlalchemy.query import Query
+from sqlalchemy import Column, Float, Integer, MetaData, Table, literal_column, or_, select
+from sqlalchemy.orm import aliased
+from sqlalchemy.sql import ColumnElement
+
+from backend.models import Client, Policy, db
+
+
+# FTS5 tables created by migration 2; declared here only to build queries.
+_fts_metadata = MetaData()
+clients_fts = Table(
+    "clients_fts", _fts_metadata, Column("rowid", Integer), Column("rank", Float)
+)
+policies_fts = Table(
+    "policies_fts", _fts_metadata, Column("rowid", Integer), Column("rank", Float)
+)
+
+_TOKEN_RE = re.compile(r"\w+")
+
+_fts_lock = threading.Lock()
+_fts_available: dict[str, bool] = {}
+
+
+def normalize_search_text(text: str) -> str:
+    """Lowercase ``text`` and strip Polish diacritics (ą -> a, ł -> l, ...)."""
+    text = text.replace("ł", "l").replace("Ł", "L")
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).lower()
+
+
+def _match_expression(search_query: str) -> str | None:
+    """Build an FTS5 query matching every token of ``search_query`` as a prefix."""
+    tokens = _TOKEN_RE.findall(normalize_search_text(search_query))
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def _fts_enabled() -> bool:
+    engine = db.engine
+    if engine.dialect.name != "sqlite":
+        return False
+
+    key = str(engine.url)
+    available = _fts_available.get(key)
+    if available is None:
+        with _fts_lock:
+            with engine.connect() as connection:
+                found = set(
+                    connection.exec_driver_sql(
+                        "SELECT name FROM sqlite_master "
+                        "WHERE type = 'table' AND name IN ('clients_fts', 'policies_fts')"
+                    ).scalars()
+                )
+            available = _fts_available[key] = found == {"clients_fts", "policies_fts"}
+    return available
+
+
+def _ranked_matches(fts_table: Table, match: str):
+    # Every match is kept so list pages reach all of them. FTS5 can only rank
+    # a match set by scoring all of it, so capping here would save nothing
+    # and, before ORDER BY rank, would keep the lowest ids instead of the best.
+    return (
+        select(fts_table.c.rowid.label("id"), fts_table.c.rank)
+        .where(literal_column(fts_table.name).op("MATCH")(match))
+        .subquery()
+    )
+
+
+def search_clients(query: Query, search_query: str) -> tuple[Query, ColumnElement | None]:
+    """Filter a ``Client`` query by ``search_query``.
+
+    Returns the filtered query and the FTS5 rank to sort by (best first), or
+    ``None`` when the ``ILIKE`` fallback is used because FTS5 is unavailable.
+    """
+    if _fts_enabled():
+        match = _match_expression(search_query)
+        if match is None:
+            return query, None
+        matches = _ranked_matches(clients_fts, match)
+        return query.join(matches, matches.c.id == Client.id), matches.c.rank
+
+    like_pattern = f"%{search_query}%"
+    query = query.filter(
+        or_(
+            Client.imie.ilike(like_pattern),
+            Client.nazwisko.ilike(like_pattern),
+            Client.email.ilike(like_pattern),
+            Client.telefon.ilike(like_pattern),
+            Client.adres.ilike(like_pattern),
+        )
+    )
+    return query, None
+
+
+def search_policies(query: Query, search_query: str) -> tuple[Query, ColumnElement | None]:
+    """Filter a ``Policy`` query by ``search_query``; see :func:`search_clients`.
+
+    The index also covers the client's name, so no join is needed.
+    """
+    if _fts_enabled():
+        match = _match_expression(search_query)
+        if match is None:
+            return query, None
+        matches = _ranked_matches(policies_fts, match)
+        return query.join(matches, matches.c.id == Policy.id), matches.c.rank
+
+    like_pattern = f"%{search_query}%"
+    query = query.join(Client).filter(
+        or_(
+            Policy.numer_polisy.ilike(like_pattern),
+            Policy.produkt.ilike(like_pattern),
+            Policy.status.ilike(like_pattern),
+            Client.imie.ilike(like_pattern),
+            Client.nazwisko.ilike(like_pattern),
+        )
+    )
+    return query, None
+
+
+def client_label(imie: str, nazwisko: str) -> str:
+    return f"{imie} {nazwisko}"
+
+
+def policy_label(numer_polisy: str, imie: str | None, nazwisko: str | None) -> str:
+    if imie is None:
+        return numer_polisy
+    return f"{numer_polisy} ({client_label(imie, nazwisko)})"
+
+
+def autocomplete_clients(term: str, limit: int) -> tuple[list[dict[str, object]], bool]:
+    """Return up to ``limit`` clients matching ``term`` for a typeahead picker.
+
+    Uses the FTS5 prefix index and fetches only the columns shown in the
+    suggestion. The flag tells whether more clients match than were returned.
+    """
+    if not term:
+        return [], False
+    query, rank = search_clients(Client.query, term)
+    order = [Client.nazwisko, Client.imie, Client.id]
+    if rank is not None:
+        order.insert(0, rank)
+    rows = (
+        query.with_entities(Client.id, Client.imie, Client.nazwisko, Client.email, Client.telefon)
+        .order_by(*order)
+        .limit(limit + 1)
+        .all()
+    )
+    return [
+        {
+            "id": row.id,
+            "label": client_label(row.imie, row.nazwisko),
+            "detail": row.email or row.telefon,
+        }
+        for row in rows[:limit]
+    ], len(rows) > limit
+
+
+def autocomplete_policies(
+    term: str, limit: int, client_id: int | None = None
+) -> tuple[list[dict[str, object]], bool]:
+    """Return up to ``limit`` policies matching ``term``, optionally of one client.
+
+    With ``client_id`` and no ``term`` the client's newest policies are listed,
+    which the event and reminder forms show once a client is picked.
+    """
+    if not term and client_id is None:
+        return [], False
+    query, rank = search_policies(Policy.query, term) if term else (Policy.query, None)
+    if client_id is not None:
+        query = query.filter(Policy.client_id == client_id)
+    # Aliased: the ILIKE fallback of search_policies already joins Client.
+    owner = aliased(Client)
+    order = [Policy.data_poczatku.desc(), Policy.id.desc()]
+    if rank is not None:
+        order.insert(0, rank)
+    rows = (
+        query.join(owner, owner.id == Policy.client_id)
+        .with_entities(Policy.id, Policy.numer_polisy, owner.imie, owner.nazwisko, Policy.produkt)
+        .order_by(*order)
+        .limit(limit + 1)
+        .all()
+    )
+    return [
+        {
+            "id": row.id,
+            "label": policy_label(row.numer_polisy, row.imie, row.nazwisko),
+            "detail": row.produkt,
+        }
+        for row in rows[:limit]
+    ], len(rows) > limit
+
+
+def _to_id(value: str | None) -> int | None:
+    try:
+        return int(value) if value else None
+    except ValueError:
+        return None
+
+
+def picker_labels(client_id: str | None, policy_id: str | None = None) -> dict[str, str]:
+    """Labels for the values already selected in a form's pickers (two key lookups)."""
+    labels = {"client": "", "policy": ""}
+    client_key, policy_key = _to_id(client_id), _to_id(policy_id)
+    client = db.session.get(Client, client_key) if client_key else None
+    if client is not None:
+        labels["client"] = client_label(client.imie, client.nazwisko)
+    policy = db.session.get(Policy, policy_key) if policy_key else None
+    if policy is not None:
+        labels["policy"] = policy_label(
+            policy.numer_polisy, policy.client.imie, policy.client.nazwisko
+        )
+    return labels
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import threading
+import time
+
+
+class SMTPSink:
+    """Minimal in-process SMTP server that accepts and discards mail.
+
+    Intended for local development and benchmarks. It speaks just enough SMTP
+    for ``smtplib`` (no STARTTLS or AUTH), and can simulate a slow or flaky
+    provider: ``latency`` seconds are added before each message is accepted,
+    ``failure_rate`` of messages are rejected with a temporary error and
+    ``disconnect_rate`` of messages drop the connection instead.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        failure_rate: float = 0.0,
+        disconnect_rate: float = 0.0,
+        keep_messages: bool = False,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.disconnect_rate = disconnect_rate
+        self.keep_messages = keep_messages
+        self.messages: list[bytes] = []
+        self.accepted = 0
+        self.rejected = 0
+        self.disconnected = 0
+        self.connections = 0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._server: asyncio.AbstractServer | None = None
+        self._thread: threading.Thread | None = None
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "SMTPSink":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="smtp-sink", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+
+    def stop(self) -> None:
+        if self._loop is None:
+            return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread is not None:
+            self._thread.join()
+        self._loop = None
+
+    def _run(self) -> None:
+        loop = asyncio.new_event_loop()
+        self._loop = loop
+        asyncio.set_event_loop(loop)
+        self._server = loop.run_until_complete(
+            asyncio.start_server(self._handle, self.host, self.port)
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            self._server.close()
+            loop.run_until_complete(self._server.wait_closed())
+            loop.close()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        with self._lock:
+            self.connections += 1
+
+        async def reply(line: str) -> None:
+            writer.write(f"{line}\r\n".encode())
+            await writer.drain()
+
+        try:
+            await reply("220 crm-smtp-sink ready")
+            while True:
+                raw = await reader.readline()
+                if not raw:
+                    break
+                command = raw.decode(errors="replace").strip()
+                verb = command.split(" ", 1)[0].upper()
+
+                if verb == "EHLO":
+                    await reply("250-crm-smtp-sink")
+                    await reply("250 8BITMIME")
+                elif verb == "HELO":
+                    await reply("250 crm-smtp-sink")
+                elif verb in ("MAIL", "RCPT", "RSET", "NOOP"):
+                    await reply("250 OK")
+                elif verb == "DATA":
+                    await reply("354 End data with <CR><LF>.<CR><LF>")
+                    data = await self._read_data(reader)
+                    if self.latency:
+                        await asyncio.sleep(self.latency)
+                    roll = random.random()
+                    if roll < self.disconnect_rate:
+                        with self._lock:
+                            self.disconnected += 1
+                        break
+                    if roll < self.disconnect_rate + self.failure_rate:
+                        with self._lock:
+                            self.rejected += 1
+                        await reply("451 Simulated temporary failure")
+                        continue
+                    with self._lock:
+                        self.accepted += 1
+                        if self.keep_messages:
+                            self.messages.append(data)
+                    await reply("250 Message accepted")
+                elif verb == "QUIT":
+                    await reply("221 Bye")
+                    break
+                else:
+                    await reply("502 Command not implemented")
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _read_data(reader: asyncio.StreamReader) -> bytes:
+        lines = []
+        while True:
+            line = await reader.readline()
+            if not line or line in (b".\r\n", b".\n"):
+                break
+            lines.append(line[1:] if line.startswith(b"..") else line)
+        return b"".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a local SMTP sink for development.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=1025)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds per message.")
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--disconnect-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    sink = SMTPSink(
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        failure_rate=args.failure_rate,
+        disconnect_rate=args.disconnect_rate,
+    )
+    sink.start()
+    print(f"SMTP sink listening on {sink.host}:{sink.port} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(5)
+            print(
+                f"accepted={sink.accepted} rejected={sink.rejected} "
+                f"disconnected={sink.disconnected} connections={sink.connections}"
+            )
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sink.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+// "Pokaż więcej" rows (load_more macro in templates/pagination.html): fetch the
+// next page of a client detail section and put its rows in place of the link.
+(function () {
+    "use strict";
+
+    document.addEventListener("click", function (event) {
+        var link = event.target.closest("a[data-load-more]");
+        if (!link) {
+            return;
+        }
+        event.preventDefault();
+        var row = link.closest("tr");
+        var text = link.textContent;
+        link.textContent = "Wczytywanie…";
+        fetch(link.href, { credentials: "same-origin" })
+            .then(function (response) {
+                if (!response.ok) {
+                    throw new Error(response.statusText);
+                }
+                return response.text();
+            })
+            .then(function (html) {
+                // The fragment ends with its own "Pokaż więcej" row if more pages exist.
+                row.insertAdjacentHTML("afterend", html);
+                row.remove();
+            })
+            .catch(function () {
+                link.textContent = text;
+            });
+    });
+})();
@@ -0,0 +1,137 @@
+// Typeahead pickers (templates/picker.html): the text input asks the picker's
+// autocomplete endpoint for suggestions and the chosen id is stored in the
+// hidden input. A picker with data-depends-on narrows its suggestions to the
+// client selected in that picker and is cleared when the client changes.
+(function () {
+    "use strict";
+
+    var DEBOUNCE_MS = 200;
+
+    function initPicker(root) {
+        var hidden = root.querySelector("input[type=hidden]");
+        var input = root.querySelector("input[type=text]");
+        var list = root.querySelector(".typeahead__results");
+        var dependsOn = root.dataset.dependsOn
+            ? document.getElementById(root.dataset.dependsOn)
+            : null;
+        var timer = null;
+        var lastRequest = 0;
+        var active = -1;
+
+        function close() {
+            list.innerHTML = "";
+            list.hidden = true;
+            active = -1;
+            input.setAttribute("aria-expanded", "false");
+        }
+
+        function setValue(id, label) {
+            var changed = hidden.value !== String(id);
+            hidden.value = id;
+            input.value = label;
+            if (changed) {
+                hidden.dispatchEvent(new Event("change"));
+            }
+        }
+
+        function highlight(index) {
+            var items = list.querySelectorAll("[role=option]");
+            if (!items.length) {
+                return;
+            }
+            active = (index + items.length) % items.length;
+            for (var i = 0; i < items.length; i++) {
+                items[i].setAttribute("aria-selected", i === active ? "true" : "false");
+            }
+        }
+
+        function render(results, more) {
+            close();
+            results.forEach(function (item) {
+                var option = document.createElement("li");
+                option.setAttribute("role", "option");
+                option.textContent = item.detail ? item.label + " — " + item.detail : item.label;
+                // mousedown fires before the input's blur, which closes the list.
+                option.addEventListener("mousedown", function (event) {
+                    event.preventDefault();
+                    setValue(item.id, item.label);
+                    close();
+                });
+                list.appendChild(option);
+            });
+            if (more) {
+                var hint = document.createElement("li");
+                hint.className = "typeahead__more";
+                hint.textContent = "Pokazano pierwsze wyniki — wpisz więcej, aby zawęzić listę.";
+                list.appendChild(hint);
+            }
+            if (results.length) {
+                list.hidden = false;
+                input.setAttribute("aria-expanded", "true");
+            }
+        }
+
+        function search() {
+            var params = new URLSearchParams();
+            var term = input.value.trim();
+            if (term) {
+                params.set("q", term);
+            }
+            if (dependsOn && dependsOn.value) {
+                params.set("client_id", dependsOn.value);
+            }
+            if (!params.toString()) {
+                close();
+                return;
+            }
+            var requestId = ++lastRequest;
+            fetch(root.dataset.url + "?" + params.toString(), {
+                headers: { Accept: "application/json" },
+                credentials: "same-origin",
+            })
+                .then(function (response) {
+                    return response.ok ? response.json() : { results: [] };
+                })
+                .then(function (data) {
+                    // Ignore answers that arrive after a newer request was sent.
+                    if (requestId === lastRequest) {
+                        render(data.results, data.more);
+                    }
+                })
+                .catch(close);
+        }
+
+        input.addEventListener("input", function () {
+            // Typed text is not a selection until a suggestion is picked.
+            setValue("", input.value);
+            clearTimeout(timer);
+            timer = setTimeout(search, DEBOUNCE_MS);
+        });
+        input.addEventListener("focus", search);
+        input.addEventListener("blur", close);
+        input.addEventListener("keydown", function (event) {
+            if (list.hidden) {
+                return;
+            }
+            if (event.key === "ArrowDown" || event.key === "ArrowUp") {
+                event.preventDefault();
+                highlight(active + (event.key === "ArrowDown" ? 1 : -1));
+            } else if (event.key === "Enter" && active >= 0) {
+                event.preventDefault();
+                list.querySelectorAll("[role=option]")[active].dispatchEvent(new Event("mousedown"));
+            } else if (event.key === "Escape") {
+                close();
+            }
+        });
+
+        if (dependsOn) {
+            dependsOn.addEventListener("change", function () {
+                setValue("", "");
+            });
+        }
+    }
+
+    document.addEventListener("DOMContentLoaded", function () {
+        document.querySelectorAll(".typeahead").forEach(initPicker);
+    });
+})();
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from itertools import chain
+from typing import Iterable
+
+from sqlalchemy import delete, event, func, inspect, insert, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from backend.models import Client, ClientSummary, Policy, Reminder
+
+
+_REFRESH_CHUNK = 500
+
+# Attributes whose change moves a client's totals.
+_TRACKED = {
+    Policy: ("client_id", "skladka"),
+    Reminder: ("client_id", "data_przypomnienia", "wyslano"),
+}
+
+
+def _summary_rows():
+    policy_count = (
+        select(func.count(Policy.id)).where(Policy.client_id == Client.id).scalar_subquery()
+    )
+    premium_total = (
+        select(func.coalesce(func.sum(Policy.skladka), 0))
+        .where(Policy.client_id == Client.id)
+        .scalar_subquery()
+    )
+    next_reminder = (
+        select(func.min(Reminder.data_przypomnienia))
+        .where(Reminder.client_id == Client.id, Reminder.wyslano.is_(False))
+        .scalar_subquery()
+    )
+    return select(Client.id, policy_count, premium_total, next_reminder)
+
+
+def refresh_client_summaries(
+    connection: Connection, client_ids: Iterable[int | None] | None = None
+) -> None:
+    """Recompute the summary rows of ``client_ids`` (all clients when ``None``).
+
+    Each client is rebuilt from its rows with indexed subqueries, so the
+    totals cannot drift the way added and subtracted deltas would.
+    """
+    table = ClientSummary.__table__
+    columns = ["client_id", "liczba_polis", "suma_skladek", "najblizsze_przypomnienie"]
+    if client_ids is None:
+        connection.execute(delete(table))
+        connection.execute(insert(table).from_select(columns, _summary_rows()))
+        return
+
+    ids = sorted({client_id for client_id in client_ids if client_id is not None})
+    for start in range(0, len(ids), _REFRESH_CHUNK):
+        chunk = ids[start : start + _REFRESH_CHUNK]
+        connection.execute(delete(table).where(table.c.client_id.in_(chunk)))
+        connection.execute(
+            insert(table).from_select(columns, _summary_rows().where(Client.id.in_(chunk)))
+        )
+
+
+def _affected_clients(session: Session) -> set[int]:
+    affected: set[int] = set()
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, Client):
+            if obj in session.deleted:
+                affected.add(obj.id)
+            continue
+        tracked = _TRACKED.get(type(obj))
+        if tracked is None:
+            continue
+        state = inspect(obj)
+        if obj in session.dirty and not any(
+            state.attrs[name].history.has_changes() for name in tracked
+        ):
+            continue
+        affected.add(obj.client_id)
+        # A policy or reminder moved to another client changes both.
+        affected.update(state.attrs.client_id.history.deleted)
+    affected.discard(None)
+    return affected
+
+
+@event.listens_for(Session, "after_flush")
+def _refresh_affected_summaries(session: Session, flush_context) -> None:
+    # Keeps client_summaries in step with ORM writes to policies and reminders.
+    # Foreign keys are populated and history is still intact at this point.
+    # Core bulk statements (bulk_insert, Query.update) bypass the hook; their
+    # callers refresh the affected clients themselves.
+    affected = _affected_clients(session)
+    if affected:
+        refresh_client_summaries(session.connection(), affected)
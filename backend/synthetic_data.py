@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from decimal import Decimal
+import logging
+import random
+from typing import Any, Iterator
+
+from sqlalchemy import func, select
+
+from backend.db import bulk_insert, sync_id_sequence
+from backend.models import Client, Event, Policy, Reminder, db
+from backend.search import normalize_search_text
+from backend.summaries import refresh_client_summaries
+
+
+logger = logging.getLogger(__name__)
+
+FIRST_NAMES = (
+    "Anna", "Maria", "Katarzyna", "Małgorzata", "Agnieszka", "Barbara", "Ewa", "Elżbieta",
+    "Zofia", "Joanna", "Piotr", "Krzysztof", "Andrzej", "Tomasz", "Paweł", "Michał",
+    "Marcin", "Łukasz", "Grzegorz", "Józef", "Jakub", "Mateusz", "Wojciech", "Zbigniew",
+)
+LAST_NAMES = (
+    "Nowak", "Kowalski", "Wiśniewski", "Wójcik", "Kowalczyk", "Kamiński", "Lewandowski",
+    "Zieliński", "Szymański", "Woźniak", "Dąbrowski", "Kozłowski", "Jankowski", "Mazur",
+    "Kwiatkowski", "Krawczyk", "Piotrowski", "Grabowski", "Nowakowski", "Pawłowski",
+    "Michalski", "Król", "Wieczorek", "Jabłoński", "Wróbel", "Górski", "Żak", "Sęk",
+)
+CITIES = (
+    "Warszawa", "Kraków", "Łódź", "Wrocław", "Poznań", "Gdańsk", "Szczecin", "Bydgoszcz",
+    "Lublin", "Białystok", "Katowice", "Gdynia", "Częstochowa", "Radom", "Toruń", "Kielce",
+)
+STREETS = ("Polna", "Leśna", "Słoneczna", "Krótka", "Szkolna", "Ogrodowa", "Lipowa", "Łąkowa")
+PRODUCTS = (
+    "OC", "OC/AC", "Dom i mieszkanie", "Na życie", "NNW", "Podróżne", "Firma", "Rolne",
+)
+STATUSES = ("aktywna", "aktywna", "aktywna", "wygasła", "anulowana", "w trakcie")
+EVENT_TITLES = (
+    "Rozmowa telefoniczna", "Spotkanie", "Wysłano ofertę", "Zgłoszenie szkody",
+    "Odnowienie polisy", "Zmiana danych", "Reklamacja",
+)
+
+_BATCH_SIZE = 5000
+
+
+@dataclass(frozen=True)
+class Scale:
+    clients: int
+    policies_per_client: float = 2.0
+    events_per_client: float = 3.0
+    reminders_per_client: float = 2.0
+
+
+SCALES = {
+    "small": Scale(clients=1_000),
+    "medium": Scale(clients=20_000),
+    "large": Scale(clients=200_000),
+}
+
+
+@dataclass
+class GeneratedCounts:
+    clients: int = 0
+    policies: int = 0
+    events: int = 0
+    reminders: int = 0
+
+
+def _count(rng: random.Random, mean: float) -> int:
+    """Draw a per-client row count averaging ``mean`` (some clients get none)."""
+    whole = int(mean)
+    return rng.randint(0, 2 * whole) if whole else int(rng.random() < mean)
+
+
+def _next_id(model) -> int:
+    return (db.session.scalar(select(func.max(model.id))) or 0) + 1
+
+
+def _flush(batches: dict[Any, list[dict[str, Any]]]) -> None:
+    # Parents first, so foreign keys always point at inserted rows.
+    for model in (Client, Policy, Event, Reminder):
+        rows = batches[model]
+        if rows:
+            bulk_insert(model.__table__, rows)
+            rows.clear()
+    db.session.commit()
+
+
+def _client_rows(rng: random.Random, scale: Scale, now: datetime, start_id: int) -> Iterator[dict]:
+    for offset in range(scale.clients):
+        first = rng.choice(FIRST_NAMES)
+        last = rng.choice(LAST_NAMES)
+        if first.endswith("a") and last.endswith("ski"):
+            last = last[:-1] + "a"
+        number = start_id + offset
+        login = normalize_search_text(f"{first}.{last}")
+        yield {
+            "id": number,
+            "imie": first,
+            "nazwisko": last,
+            "email": f"{login}{number}@example.com" if rng.random() < 0.85 else None,
+            "telefon": f"+48 {rng.randint(500, 899)} {rng.randint(100, 999)} {rng.randint(100, 999)}",
+            "adres": f"ul. {rng.choice(STREETS)} {rng.randint(1, 120)}, {rng.choice(CITIES)}",
+            "data_utworzenia": now - timedelta(days=rng.randint(0, 5 * 365)),
+        }
+
+
+def generate(scale: Scale, seed: int = 0, now: datetime | None = None) -> GeneratedCounts:
+    """Append a realistic, reproducible data set of the given ``scale``.
+
+    Policies start within the last three years (some already expired),
+    events fall in the last year and reminders spread from a month ago to a
+    month ahead, so the dashboard buckets, lists and exports all have data.
+    Must run inside an application context.
+    """
+    rng = random.Random(seed)
+    now = now or datetime.now()
+    today = now.date()
+    counts = GeneratedCounts()
+    batches: dict[Any, list[dict[str, Any]]] = {
+        Client: [], Policy: [], Event: [], Reminder: []
+    }
+    policy_id = _next_id(Policy)
+    event_id = _next_id(Event)
+    reminder_id = _next_id(Reminder)
+
+    for client in _client_rows(rng, scale, now, _next_id(Client)):
+        batches[Client].append(client)
+        counts.clients += 1
+        client_policies: list[int] = []
+
+        for _ in range(_count(rng, scale.policies_per_client)):
+            start = today - timedelta(days=rng.randint(0, 3 * 365))
+            batches[Policy].append(
+                {
+                    "id": policy_id,
+                    "numer_polisy": f"PL/{start.year}/{policy_id:08d}",
+                    "produkt": rng.choice(PRODUCTS),
+                    "data_poczatku": start,
+                    "data_konca": start + timedelta(days=365) if rng.random() < 0.9 else None,
+                    "skladka": Decimal(rng.randint(30_000, 500_000)) / 100,
+                    "status": rng.choice(STATUSES),
+                    "client_id": client["id"],
+                }
+            )
+            client_policies.append(policy_id)
+            policy_id += 1
+            counts.policies += 1
+
+        for _ in range(_count(rng, scale.events_per_client)):
+            batches[Event].append(
+                {
+                    "id": event_id,
+                    "tytul": rng.choice(EVENT_TITLES),
+                    "opis": "Dane wygenerowane do testów wydajności.",
+                    "data_wydarzenia": now - timedelta(minutes=rng.randint(0, 365 * 24 * 60)),
+                    "client_id": client["id"],
+                    "policy_id": rng.choice(client_policies) if client_policies and rng.random() < 0.7 else None,
+                }
+            )
+            event_id += 1
+            counts.events += 1
+
+        for _ in range(_count(rng, scale.reminders_per_client)):
+            due = now + timedelta(minutes=rng.randint(-30 * 24 * 60, 30 * 24 * 60))
+            batches[Reminder].append(
+                {
+                    "id": reminder_id,
+                    "tresc": f"Kontakt z klientem {client['imie']} {client['nazwisko']}",
+                    "data_przypomnienia": due,
+                    "wyslano": due < now and rng.random() < 0.8,
+                    "client_id": client["id"],
+                    "policy_id": rng.choice(client_policies) if client_policies else None,
+                }
+            )
+            reminder_id += 1
+            counts.reminders += 1
+
+        if len(batches[Client]) >= _BATCH_SIZE:
+            _flush(batches)
+
+    _flush(batches)
+    for model in (Client, Policy, Event, Reminder):
+        sync_id_sequence(model)
+    refresh_client_summaries(db.session.connection())
+    db.session.commit()
+    logger.info(
+        "Generated %s clients, %s policies, %s events and %s reminders",
+        counts.clients, counts.policies, counts.events, counts.reminders,
+    )
+    return counts
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import logging
+import threading
+from time import monotonic
+from typing import Any, Mapping
+
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from backend.config import Config
+from backend.models import UserConfig
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SEND_HOUR = 8
+DEFAULT_DAYS_BEFORE_EXPIRY = 30
+
+_SESSION_FLAG = "user_config_changed"
+
+
+@dataclass(frozen=True)
+class SettingsSnapshot:
+    """Resolved application settings (``Config`` overridden by ``UserConfig``)."""
+
+    smtp: Mapping[str, Any]
+    notification_email: str | None
+    send_hour: int
+    days_before_expiry: int
+
+
+_lock = threading.Lock()
+_snapshot: SettingsSnapshot | None = None
+_expires_at = 0.0
+
+
+def _get_config_value(
+    user_config: UserConfig | None,
+    app_config: Mapping[str, Any] | Config,
+    app_key: str,
+    user_key: str | None = None,
+    default: Any | None = None,
+) -> Any:
+    if user_config is not None and user_key:
+        value = getattr(user_config, user_key, None)
+        if value not in (None, ""):
+            return value
+
+    if isinstance(app_config, Mapping):
+        value = app_config.get(app_key)
+    else:
+        value = getattr(app_config, app_key, None)
+
+    if value not in (None, ""):
+        return value
+
+    return default
+
+
+def _build_smtp_settings(
+    user_config: UserConfig | None, app_config: Mapping[str, Any] | Config
+) -> dict[str, Any]:
+    mail_server = _get_config_value(user_config, app_config, "MAIL_SERVER", "mail_server")
+    mail_port = int(
+        _get_config_value(user_config, app_config, "MAIL_PORT", "mail_port", Config.MAIL_PORT)
+    )
+    mail_use_tls = bool(
+        _get_config_value(
+            user_config, app_config, "MAIL_USE_TLS", "mail_use_tls", Config.MAIL_USE_TLS
+        )
+    )
+    mail_username = _get_config_value(
+        user_config, app_config, "MAIL_USERNAME", "mail_username", Config.MAIL_USERNAME
+    )
+    mail_password = _get_config_value(
+        user_config, app_config, "MAIL_PASSWORD", "mail_password", Config.MAIL_PASSWORD
+    )
+    default_sender = _get_config_value(
+        user_config,
+        app_config,
+        "MAIL_DEFAULT_SENDER",
+        "email",
+        Config.MAIL_DEFAULT_SENDER,
+    )
+
+    return {
+        "server": mail_server,
+        "port": mail_port,
+        "use_tls": mail_use_tls,
+        "username": mail_username,
+        "password": mail_password,
+        "default_sender": default_sender,
+    }
+
+
+def _build_snapshot(
+    user_config: UserConfig | None, app_config: Mapping[str, Any] | Config
+) -> SettingsSnapshot:
+    send_hour = user_config.send_hour if user_config and user_config.send_hour is not None else None
+    if not isinstance(send_hour, int) or not 0 <= send_hour <= 23:
+        send_hour = DEFAULT_SEND_HOUR
+
+    days_before_expiry = user_config.dni_przed_wygasnieciem if user_config else None
+    if not isinstance(days_before_expiry, int) or days_before_expiry < 0:
+        days_before_expiry = DEFAULT_DAYS_BEFORE_EXPIRY
+
+    return SettingsSnapshot(
+        smtp=_build_smtp_settings(user_config, app_config),
+        notification_email=user_config.email if user_config and user_config.email else None,
+        send_hour=send_hour,
+        days_before_expiry=days_before_expiry,
+    )
+
+
+def get_settings() -> SettingsSnapshot:
+    """Return the cached settings snapshot, loading it on first use.
+
+    Commits in this process drop the snapshot at once; changes made by other
+    processes (a web worker editing settings while another process runs the
+    scheduler) are picked up when it expires after ``SETTINGS_CACHE_SECONDS``.
+    Outside an application context only ``Config`` is available, so the result
+    is built on the fly and never cached.
+    """
+    global _snapshot, _expires_at
+
+    if not has_app_context():
+        return _build_snapshot(None, Config)
+
+    snapshot = _snapshot
+    if snapshot is not None and _expires_at > monotonic():
+        return snapshot
+
+    with _lock:
+        if _snapshot is not None and _expires_at > monotonic():
+            return _snapshot
+        try:
+            user_config = UserConfig.query.first()
+        except Exception:
+            logger.exception("Failed to load UserConfig for settings")
+            return _build_snapshot(None, current_app.config)
+        _snapshot = _build_snapshot(user_config, current_app.config)
+        _expires_at = monotonic() + max(0, current_app.config["SETTINGS_CACHE_SECONDS"])
+        return _snapshot
+
+
+def invalidate_settings() -> None:
+    """Drop the cached snapshot; the next :func:`get_settings` reloads it."""
+    global _snapshot
+
+    with _lock:
+        _snapshot = None
+
+
+@event.listens_for(Session, "after_flush")
+def _track_user_config_changes(session: Session, flush_context: Any) -> None:
+    changed = (*session.new, *session.dirty, *session.deleted)
+    if any(isinstance(instance, UserConfig) for instance in changed):
+        session.info[_SESSION_FLAG] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session: Session) -> None:
+    if session.info.pop(_SESSION_FLAG, False):
+        invalidate_settings()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_on_rollback(session: Session) -> None:
+    session.info.pop(_SESSION_FLAG, None)
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import argparse
+import sys
+
+from backend.backup import BackupError, create_backup
+from backend.config import Config
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Take a compressed online backup of the CRM database while it is in use."
+    )
+    parser.add_argument(
+        "--database-url",
+        dest="database_url",
+        help="Optional database URL to override the configured database.",
+    )
+    parser.add_argument(
+        "--dir",
+        dest="backup_dir",
+        default=Config.BACKUP_DIR,
+        help="Directory for snapshots (default: BACKUP_DIR).",
+    )
+    parser.add_argument(
+        "--keep",
+        type=int,
+        default=Config.BACKUP_KEEP,
+        help="Number of newest snapshots to keep (default: BACKUP_KEEP).",
+    )
+    parser.add_argument(
+        "--pages-per-step",
+        type=int,
+        default=Config.BACKUP_PAGES_PER_STEP,
+        help="Pages copied per backup step (default: BACKUP_PAGES_PER_STEP).",
+    )
+    args = parser.parse_args()
+
+    try:
+        path = create_backup(
+            args.database_url,
+            args.backup_dir,
+            keep=args.keep,
+            pages_per_step=args.pages_per_step,
+        )
+    except BackupError as exc:
+        print(f"Backup failed: {exc}", file=sys.stderr)
+        sys.exit(1)
+    print(f"Backup written to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import argparse
+from datetime import datetime, timedelta
+import os
+from pathlib import Path
+import statistics
+import tempfile
+import time
+
+
+def _percentile(values: list[float], percentile: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(percentile / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _seed(count: int) -> None:
+    from sqlalchemy import insert
+
+    from backend.models import Client, Policy, Reminder, db
+
+    now = datetime.now()
+    clients = max(1, count // 10)
+    db.session.execute(
+        insert(Client),
+        [
+            {
+                "imie": f"Imię{index}",
+                "nazwisko": f"Nazwisko{index}",
+                "email": f"klient{index}@example.com",
+                "telefon": f"+48 600 {index:06d}",
+                "data_utworzenia": now,
+            }
+            for index in range(clients)
+        ],
+    )
+    db.session.execute(
+        insert(Policy),
+        [
+            {
+                "numer_polisy": f"BENCH/{index:08d}",
+                "produkt": "OC/AC",
+                "data_poczatku": now.date(),
+                "data_konca": (now + timedelta(days=365)).date(),
+                "skladka": 1000,
+                "status": "aktywna",
+                "client_id": index % clients + 1,
+            }
+            for index in range(clients)
+        ],
+    )
+    db.session.execute(
+        insert(Reminder),
+        [
+            {
+                "tresc": f"Przypomnienie testowe {index}",
+                "data_przypomnienia": now - timedelta(minutes=index),
+                "wyslano": False,
+                "client_id": index % clients + 1,
+                "policy_id": index % clients + 1,
+            }
+            for index in range(count)
+        ],
+    )
+    db.session.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark send_due_reminders against a local SMTP sink."
+    )
+    parser.add_argument("--reminders", type=int, default=1000, help="Number of due reminders.")
+    parser.add_argument("--workers", type=int, default=1, help="REMINDER_DISPATCH_WORKERS.")
+    parser.add_argument("--chunk-size", type=int, default=500, help="REMINDER_DISPATCH_CHUNK_SIZE.")
+    parser.add_argument("--digest", action="store_true", help="Use digest mode.")
+    parser.add_argument("--latency", type=float, default=0.0, help="SMTP latency per message (s).")
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--disconnect-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="crm-bench-"))
+    # Config reads the environment on import, so configure it before importing the app.
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir / 'bench.sqlite3'}"
+    os.environ["SCHEDULER_ENABLED"] = "false"
+
+    from sqlalchemy import event
+
+    from backend import create_app, scheduler
+    from backend.emailer import SMTPMailer
+    from backend.models import Reminder, db
+    from backend.smtp_sink import SMTPSink
+    from backend.user_settings import invalidate_settings
+
+    with SMTPSink(
+        latency=args.latency,
+        failure_rate=args.failure_rate,
+        disconnect_rate=args.disconnect_rate,
+    ) as sink:
+        app = create_app()
+        app.config.update(
+            MAIL_SERVER=sink.host,
+            MAIL_PORT=sink.port,
+            MAIL_USE_TLS=False,
+            MAIL_USERNAME="",
+            MAIL_PASSWORD="",
+            MAIL_DEFAULT_SENDER="agent@example.com",
+            REMINDER_DISPATCH_WORKERS=args.workers,
+            REMINDER_DISPATCH_CHUNK_SIZE=args.chunk_size,
+            REMINDER_DIGEST_ENABLED=args.digest,
+        )
+        invalidate_settings()
+
+        with app.app_context():
+            _seed(args.reminders)
+
+            db_time = 0.0
+            query_count = 0
+
+            def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+                conn.info.setdefault("bench_start", []).append(time.perf_counter())
+
+            def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+                nonlocal db_time, query_count
+                db_time += time.perf_counter() - conn.info["bench_start"].pop()
+                query_count += 1
+
+            event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+            event.listen(db.engine, "after_cursor_execute", after_cursor_execute)
+
+        latencies: list[float] = []
+        original_send = SMTPMailer.send
+
+        def timed_send(self, subject: str, body: str, to_addr: str) -> bool:
+            started = time.perf_counter()
+            try:
+                return original_send(self, subject, body, to_addr)
+            finally:
+                latencies.append(time.perf_counter() - started)
+
+        SMTPMailer.send = timed_send
+        started = time.perf_counter()
+        try:
+            scheduler.send_due_reminders(app)
+        finally:
+            SMTPMailer.send = original_send
+        elapsed = time.perf_counter() - started
+
+        with app.app_context():
+            sent = Reminder.query.filter_by(wyslano=True).count()
+
+    print(f"Reminders seeded:     {args.reminders}")
+    print(f"Reminders flagged:    {sent}")
+    print(f"Messages accepted:    {sink.accepted} (rejected {sink.rejected}, dropped {sink.disconnected})")
+    print(f"SMTP connections:     {sink.connections}")
+    print(f"Wall time:            {elapsed:.3f} s")
+    print(f"Throughput:           {len(latencies) / elapsed if elapsed else 0:.1f} msg/s")
+    if latencies:
+        print(f"Send latency p50:     {_percentile(latencies, 50) * 1000:.2f} ms")
+        print(f"Send latency p99:     {_percentile(latencies, 99) * 1000:.2f} ms")
+        print(f"Send latency mean:    {statistics.fmean(latencies) * 1000:.2f} ms")
+    print(f"DB time:              {db_time:.3f} s over {query_count} statements")
+
+
+if __name__ == "__main__":
+    main()
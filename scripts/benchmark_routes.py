@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+from pathlib import Path
+import sys
+import tempfile
+import time
+import tracemalloc
+
+
+# Committed: query counts only, which are the same on every machine.
+DEFAULT_BASELINE = Path(__file__).with_name("benchmark_routes_baseline.json")
+# Not committed (.gitignore): latency and memory, which only compare on one machine.
+DEFAULT_LOCAL_BASELINE = Path(__file__).with_name("benchmark_routes_local.json")
+SCALE_NAMES = ("small", "medium", "large")
+
+# (name, URL) pairs covering every blueprint; detail pages use the first row.
+ROUTES = (
+    ("dashboard", "/dashboard"),
+    ("clients.list", "/clients/"),
+    ("clients.search", "/clients/?q=nowak"),
+    ("clients.detail", "/clients/1"),
+    ("clients.events", "/clients/1/events"),
+    ("clients.new", "/clients/new"),
+    ("clients.autocomplete", "/clients/autocomplete?q=now"),
+    ("clients.edit", "/clients/1/edit"),
+    ("policies.list", "/policies/"),
+    ("policies.search", "/policies/?q=kowalsk"),
+    ("policies.detail", "/policies/1"),
+    ("policies.new", "/policies/new"),
+    ("policies.autocomplete", "/policies/autocomplete?q=kowalsk"),
+    ("policies.edit", "/policies/1/edit"),
+    ("events.list", "/events/"),
+    ("events.detail", "/events/1"),
+    ("events.new", "/events/new"),
+    ("events.edit", "/events/1/edit"),
+    ("reminders.list", "/reminders/"),
+    ("reminders.detail", "/reminders/1"),
+    ("reminders.new", "/reminders/new"),
+    ("reminders.edit", "/reminders/1/edit"),
+    ("settings", "/settings/"),
+    ("import", "/import/"),
+    ("export.clients", "/export/clients.csv"),
+    ("export.policies", "/export/policies.csv"),
+)
+
+
+def _percentile(values: list[float], percentile: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(percentile / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _measure(client, url: str, repeat: int, counter: dict[str, int]) -> dict[str, float | int]:
+    # Streamed responses (CSV export) only do their work while being read.
+    client.get(url).get_data()
+
+    latencies: list[float] = []
+    for _ in range(repeat):
+        counter["queries"] = 0
+        started = time.perf_counter()
+        response = client.get(url)
+        response.get_data()
+        latencies.append(time.perf_counter() - started)
+        if response.status_code != 200:
+            raise RuntimeError(f"{url} returned HTTP {response.status_code}")
+    queries = counter["queries"]
+
+    # tracemalloc slows Python down several times, so memory gets its own run.
+    tracemalloc.start()
+    try:
+        client.get(url).get_data()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(_percentile(latencies, 95) * 1000, 2),
+        "queries": queries,
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def _compare(
+    results: dict[str, dict], baseline: dict[str, dict], threshold: float
+) -> list[str]:
+    """Return a description of every metric that got worse than ``baseline``."""
+    regressions: list[str] = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        if current["queries"] > previous["queries"]:
+            regressions.append(
+                f"{name}: queries {previous['queries']} -> {current['queries']}"
+            )
+        for metric in ("p50_ms", "peak_kib"):
+            if metric not in previous:
+                continue
+            limit = previous[metric] * (1 + threshold)
+            if current[metric] > limit:
+                regressions.append(
+                    f"{name}: {metric} {previous[metric]} -> {current[metric]}"
+                )
+    return regressions
+
+
+def _load(path: Path) -> dict:
+    return json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+
+
+def _save(path: Path, data: dict) -> None:
+    path.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark every view on synthetic data and compare with a baseline."
+    )
+    parser.add_argument("--scale", choices=SCALE_NAMES, default="small")
+    parser.add_argument("--clients", type=int, help="Override the number of clients.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5, help="Timed requests per route.")
+    parser.add_argument("--route", action="append", help="Only run routes with this name.")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--local-baseline", type=Path, default=DEFAULT_LOCAL_BASELINE)
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Store query counts in --baseline and all metrics in --local-baseline.",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.5,
+        help="Allowed relative increase of latency and memory (0.5 = +50%%).",
+    )
+    parser.add_argument("--fail-on-regression", action="store_true")
+    parser.add_argument("--output", type=Path, help="Also write the results as JSON.")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="crm-bench-"))
+    # Config reads the environment on import, so configure it before importing the app.
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir / 'bench.sqlite3'}"
+    os.environ["SCHEDULER_ENABLED"] = "false"
+    # Measure the dashboard query itself rather than its cache.
+    os.environ.setdefault("DASHBOARD_CACHE_SECONDS", "0")
+    # Keep the header on so timings include it, as on a development machine.
+    os.environ.setdefault("SQL_SERVER_TIMING", "true")
+    # Repeated statements already show up in the query column.
+    logging.getLogger("backend.instrumentation").setLevel(logging.ERROR)
+
+    from sqlalchemy import event
+
+    from backend import create_app
+    from backend.models import User, db
+    from backend.synthetic_data import SCALES, Scale, generate
+
+    scale = Scale(clients=args.clients) if args.clients else SCALES[args.scale]
+    scale_key = f"clients-{args.clients}" if args.clients else args.scale
+    app = create_app()
+    counter = {"queries": 0}
+
+    with app.app_context():
+        started = time.perf_counter()
+        counts = generate(scale, seed=args.seed)
+        print(
+            f"Seeded {counts.clients} clients, {counts.policies} policies, "
+            f"{counts.events} events, {counts.reminders} reminders "
+            f"in {time.perf_counter() - started:.1f} s"
+        )
+        user = User(email="benchmark@example.com")
+        user.set_password("benchmark")
+        db.session.add(user)
+        db.session.commit()
+
+        def count_query(conn, cursor, statement, parameters, context, executemany):
+            counter["queries"] += 1
+
+        event.listen(db.engine, "before_cursor_execute", count_query)
+
+    client = app.test_client()
+    response = client.post(
+        "/login", json={"email": "benchmark@example.com", "password": "benchmark"}
+    )
+    if response.status_code != 200:
+        raise SystemExit(f"Login failed with HTTP {response.status_code}")
+
+    selected = [(name, url) for name, url in ROUTES if not args.route or name in args.route]
+    results: dict[str, dict] = {}
+    print(f"{'route':<20} {'p50 ms':>9} {'p95 ms':>9} {'queries':>8} {'peak KiB':>10}")
+    for name, url in selected:
+        results[name] = metrics = _measure(client, url, max(1, args.repeat), counter)
+        print(
+            f"{name:<20} {metrics['p50_ms']:>9.2f} {metrics['p95_ms']:>9.2f} "
+            f"{metrics['queries']:>8} {metrics['peak_kib']:>10.1f}"
+        )
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+
+    stored = _load(args.baseline)
+    local = _load(args.local_baseline)
+    if args.save_baseline:
+        queries = {name: {"queries": metrics["queries"]} for name, metrics in results.items()}
+        stored[scale_key] = {**stored.get(scale_key, {}), **queries}
+        local[scale_key] = {**local.get(scale_key, {}), **results}
+        _save(args.baseline, stored)
+        _save(args.local_baseline, local)
+        print(
+            f"Baseline for '{scale_key}' saved to {args.baseline} (queries) "
+            f"and {args.local_baseline} (all metrics)"
+        )
+        return
+
+    # Latency and memory are only compared when this machine has saved them.
+    local_metrics = local.get(scale_key, {})
+    baseline = {
+        name: {**local_metrics.get(name, {}), **metrics}
+        for name, metrics in stored.get(scale_key, {}).items()
+    }
+    if not baseline:
+        print(f"No baseline for '{scale_key}' in {args.baseline}; run with --save-baseline.")
+        return
+    regressions = _compare(results, baseline, args.threshold)
+    if not regressions:
+        print(f"No regressions against the '{scale_key}' baseline.")
+        return
+    print("Regressions:")
+    for line in regressions:
+        print(f"  {line}")
+    if args.fail_on_regression:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
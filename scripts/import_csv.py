@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import argparse
+import csv
+from pathlib import Path
+import sys
+import time
+
+from backend.db import create_db_app
+from backend.importer import DEFAULT_BATCH_SIZE, CSVImportError, import_clients, import_policies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import clients or policies from a CSV file.")
+    parser.add_argument("kind", choices=("clients", "policies"))
+    parser.add_argument("path", type=Path, help="CSV file in the /export/*.csv layout.")
+    parser.add_argument(
+        "--report",
+        type=Path,
+        help="Where to write rejected rows (default: <path>.errors.csv).",
+    )
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument(
+        "--database-url",
+        dest="database_url",
+        help="Optional database URL to override the configured database.",
+    )
+    args = parser.parse_args()
+
+    report_path = args.report or args.path.with_name(f"{args.path.name}.errors.csv")
+    importer = import_clients if args.kind == "clients" else import_policies
+    app = create_db_app(args.database_url)
+
+    started = time.perf_counter()
+    with args.path.open(encoding="utf-8-sig", newline="") as source, report_path.open(
+        "w", encoding="utf-8", newline=""
+    ) as report_file:
+        # The report keeps the input columns, so it can be fixed and imported again.
+        writer: csv.DictWriter | None = None
+
+        def on_error(line: int, message: str, row: dict[str, str]) -> None:
+            nonlocal writer
+            if writer is None:
+                writer = csv.DictWriter(
+                    report_file, fieldnames=["wiersz", "blad", *row], extrasaction="ignore"
+                )
+                writer.writeheader()
+            writer.writerow({"wiersz": line, "blad": message, **row})
+
+        try:
+            with app.app_context():
+                result = importer(source, on_error=on_error, batch_size=args.batch_size)
+        except CSVImportError as exc:
+            print(f"Import failed: {exc}", file=sys.stderr)
+            sys.exit(1)
+
+    elapsed = time.perf_counter() - started
+    print(f"Imported {result.inserted} {args.kind} in {elapsed:.1f} s, rejected {result.failed}.")
+    if result.failed:
+        print(f"Rejected rows written to {report_path}")
+    else:
+        report_path.unlink(missing_ok=True)
+
+
+if __name__ == "__main__":
+    main()